@@ -7,14 +7,14 @@ logging.basicConfig(level='INFO', format=log_format)
 
 with open('ingredients.json') as fileIngredients:
     result = []
-    pushed_units = []
+    pushed_units = set()
     json_data = json.load(fileIngredients)
 
     for index, ingredient in enumerate(json_data):
         if ingredient["measurement_unit"] in pushed_units:
             logging.info(f'skip {ingredient["measurement_unit"]}')
         else:
-            pushed_units.append(ingredient["measurement_unit"])
+            pushed_units.add(ingredient["measurement_unit"])
             result.append(
                 {
                     'model': 'recipes.measurementUnit',
@@ -0,0 +1,49 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import SAFE_METHODS
+
+
+def get_token_cache_key(key):
+    return f'api:auth-token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def get_user_cache_key(user_id):
+    return f'api:auth-user:{user_id}'
+
+
+def invalidate_tokens(keys):
+    cache.delete_many([get_token_cache_key(key) for key in keys])
+
+
+def invalidate_user(user_id):
+    cache.delete(get_user_cache_key(user_id))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    use_cache = False
+
+    def authenticate(self, request):
+        self.use_cache = request.method in SAFE_METHODS
+        return super(CachedTokenAuthentication, self).authenticate(request)
+
+    def authenticate_credentials(self, key):
+        if not self.use_cache:
+            return super(CachedTokenAuthentication, self).authenticate_credentials(key)
+        cache_key = get_token_cache_key(key)
+        user_id = cache.get(cache_key)
+        user = None
+        if user_id is not None:
+            user = cache.get(get_user_cache_key(user_id))
+        if user is None:
+            user, token = super(
+                CachedTokenAuthentication, self
+            ).authenticate_credentials(key)
+            cache.set_many(
+                {cache_key: user.pk, get_user_cache_key(user.pk): user},
+                settings.AUTH_TOKEN_CACHE_TIMEOUT,
+            )
+            return user, token
+        return user, self.get_model()(key=key, user=user)
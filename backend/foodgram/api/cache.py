@@ -0,0 +1,34 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from recipes.cache import bump_cache_version, get_cache_version, reference_data
+
+RECIPE_RESPONSES_VERSION_KEY = 'api:recipe-responses-version'
+
+
+def invalidate_recipe_responses():
+    bump_cache_version(RECIPE_RESPONSES_VERSION_KEY)
+
+
+def get_recipe_response_cache_key(request):
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return (
+        f'api:recipe-response:{get_cache_version(RECIPE_RESPONSES_VERSION_KEY)}:'
+        f'{reference_data.get_version()}:{url_hash}'
+    )
+
+
+def get_cached_response(handler, request, *args, **kwargs):
+    if not request.user.is_anonymous:
+        return handler(request, *args, **kwargs)
+    cache_key = get_recipe_response_cache_key(request)
+    data = cache.get(cache_key)
+    if data is not None:
+        return Response(data)
+    response = handler(request, *args, **kwargs)
+    if response.status_code == 200:
+        cache.set(cache_key, response.data, settings.RECIPE_RESPONSE_CACHE_TIMEOUT)
+    return response
@@ -0,0 +1,60 @@
+import re
+
+from django.db import connection
+from django.db.models import Count
+
+from recipes.models import FavouriteRecipe, Recipe, RecipeIngredient, RecipeTag
+from recipes.search import search_recipes
+from shopping_cart.models import ShoppingListItem, ShoppingOrder
+from users.models import Follow, User
+
+from .queries import annotate_user_flags, get_shopping_cart_query
+
+HOT_TABLES = (
+    RecipeTag._meta.db_table,
+    RecipeIngredient._meta.db_table,
+    FavouriteRecipe._meta.db_table,
+    ShoppingOrder._meta.db_table,
+    ShoppingListItem._meta.db_table,
+    Follow._meta.db_table,
+)
+FULL_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)(?! USING)\s*$', re.MULTILINE),
+}
+
+
+def get_hot_queries():
+    user = (
+        User.objects.annotate(favourites_total=Count('favourites'))
+        .order_by('-favourites_total')
+        .first()
+    )
+    recipe = Recipe.objects.first()
+    tag_id = RecipeTag.objects.values_list('tag', flat=True).first()
+    return {
+        'recipes_by_tag': Recipe.objects.filter(
+            id__in=RecipeTag.objects.filter(tag=tag_id).values('recipe')
+        )[:6],
+        'recipe_user_flags': annotate_user_flags(
+            Recipe.objects.filter(pk=recipe.pk), user
+        ),
+        'favourite_recipes': Recipe.objects.filter(favourites__user=user)[:6],
+        'shopping_cart_recipes': Recipe.objects.filter(shopping_orders__user=user)[:6],
+        'recipe_favourited_by': FavouriteRecipe.objects.filter(recipe=recipe),
+        'recipe_ingredients': RecipeIngredient.objects.filter(
+            recipe__in=[recipe.pk]
+        ).values('ingredient', 'amount'),
+        'shopping_cart_aggregate': get_shopping_cart_query(user),
+        'shopping_cart_base_units': get_shopping_cart_query(user, 'base'),
+        'recipe_search': search_recipes(Recipe.objects.all(), recipe.name)[:6],
+        'subscriptions': Follow.objects.filter(user=user)[:6],
+        'followers': Follow.objects.filter(author=user).values('user'),
+    }
+
+
+def get_full_scans(plan):
+    pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        return []
+    return sorted(table for table in set(pattern.findall(plan)) if table in HOT_TABLES)
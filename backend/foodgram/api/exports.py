@@ -0,0 +1,37 @@
+import csv
+import json
+
+SHOPPING_CART_TITLE = 'Список ингредиентов для покупки:'
+SHOPPING_CART_FIELDS = ('name', 'amount', 'measurement_unit')
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def shopping_cart_txt(ingredients):
+    yield SHOPPING_CART_TITLE
+    for ingredient in ingredients:
+        yield '\n- {name}: {amount} {measurement_unit}'.format(**ingredient)
+
+
+def shopping_cart_csv(ingredients):
+    writer = csv.writer(Echo())
+    yield writer.writerow(SHOPPING_CART_FIELDS)
+    for ingredient in ingredients:
+        yield writer.writerow([ingredient[field] for field in SHOPPING_CART_FIELDS])
+
+
+def shopping_cart_json(ingredients):
+    yield '['
+    for index, ingredient in enumerate(ingredients):
+        yield (',' if index else '') + json.dumps(ingredient, ensure_ascii=False)
+    yield ']'
+
+
+SHOPPING_CART_FORMATS = {
+    'txt': (shopping_cart_txt, 'text/plain; charset=utf-8'),
+    'csv': (shopping_cart_csv, 'text/csv; charset=utf-8'),
+    'json': (shopping_cart_json, 'application/json'),
+}
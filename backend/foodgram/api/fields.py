@@ -1,14 +1,51 @@
 import base64
-from datetime import datetime
+import binascii
+import hashlib
+import os
+import re
+import tempfile
 
-from django.core.files.base import ContentFile
+from django.core.files import File
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
+from recipes.images import get_image_name
+
+BASE64_CHUNK_SIZE = 64 * 1024
+SPOOLED_FILE_MAX_SIZE = 1024 * 1024
+BASE64_IGNORED_RE = re.compile(r'[^A-Za-z0-9+/=]')
+
 
 class RecipeImageField(serializers.ImageField):
     def to_internal_value(self, data):
-        format, imgstr = data.split(';base64,')
-        ext = format.split('/')[-1]
-        name = datetime.now().strftime('%Y-%m-%d_%H:%M:%S') + '_recipe_image.' + ext
-        result = ContentFile(base64.b64decode(imgstr), name=name)
-        return super(RecipeImageField, self).to_internal_value(result)
+        try:
+            format, imgstr = data.split(';base64,')
+        except (AttributeError, ValueError):
+            self.fail('invalid')
+        ext = re.sub(r'[^a-z0-9]', '', format.split('/')[-1].lower()) or 'img'
+        digest = hashlib.sha256()
+        image_file = tempfile.SpooledTemporaryFile(max_size=SPOOLED_FILE_MAX_SIZE)
+        remainder = ''
+        try:
+            for start in range(0, len(imgstr), BASE64_CHUNK_SIZE):
+                encoded = remainder + BASE64_IGNORED_RE.sub(
+                    '', imgstr[start : start + BASE64_CHUNK_SIZE]
+                )
+                size = len(encoded) - len(encoded) % 4
+                encoded, remainder = encoded[:size], encoded[size:]
+                chunk = base64.b64decode(encoded)
+                digest.update(chunk)
+                image_file.write(chunk)
+            if remainder:
+                base64.b64decode(remainder)
+        except binascii.Error:
+            image_file.close()
+            self.fail('invalid')
+        name = get_image_name(digest.hexdigest(), ext)
+        if default_storage.exists(name):
+            image_file.close()
+            return name
+        image_file.seek(0)
+        return super(RecipeImageField, self).to_internal_value(
+            File(image_file, name=os.path.basename(name))
+        )
@@ -1,14 +1,6 @@
 import django_filters
 
-from recipes.models import Ingredient, Recipe, Tag
-
-
-class IngredientFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(field_name='name', lookup_expr='icontains')
-
-    class Meta:
-        model = Ingredient
-        fields = []
+from recipes.models import Recipe, Tag
 
 
 class RecipeFilter(django_filters.FilterSet):
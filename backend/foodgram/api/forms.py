@@ -0,0 +1,6 @@
+from django import forms
+
+
+class IngredientSearchForm(forms.Form):
+    name = forms.CharField(required=False)
+    limit = forms.IntegerField(required=False, min_value=1, max_value=1000)
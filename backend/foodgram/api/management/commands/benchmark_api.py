@@ -0,0 +1,208 @@
+import base64
+import json
+import random
+import statistics
+import time
+from io import BytesIO
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.authtoken.models import Token
+
+from recipes.models import Ingredient, Recipe, Tag
+from users.models import User
+
+BENCHMARK_HOST = 'localhost'
+SCENARIOS = (
+    'recipe_feed',
+    'recipe_feed_cursor',
+    'recipe_detail',
+    'create_recipe',
+    'subscriptions',
+    'subscription_feed',
+    'download_cart',
+    'ingredient_autocomplete',
+)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def get_image_data():
+    buffer = BytesIO()
+    Image.new('RGB', (800, 600), (73, 182, 78)).save(buffer, 'PNG')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет сценарии нагрузки через тестовый клиент Django и выводит '
+        'пропускную способность, перцентили задержки и число SQL-запросов в JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+        parser.add_argument('--compare', help='JSON-отчёт для сравнения')
+
+    def get_user(self):
+        user = (
+            User.objects.annotate(follows=Count('follower'))
+            .filter(cart_size__gt=0, follows__gt=0)
+            .order_by('-follows')
+            .first()
+        )
+        if user is None:
+            raise CommandError('Нет данных для замеров, сначала выполните seed_data')
+        return user
+
+    def setup(self, rng):
+        self.user = self.get_user()
+        token, _ = Token.objects.get_or_create(user=self.user)
+        self.client = Client(
+            HTTP_HOST=BENCHMARK_HOST, HTTP_AUTHORIZATION=f'Token {token.key}'
+        )
+        self.recipe_ids = list(Recipe.objects.values_list('id', flat=True)[:10000])
+        self.tag_slugs = list(Tag.objects.values_list('slug', flat=True))
+        self.tag_ids = list(Tag.objects.values_list('id', flat=True))
+        self.ingredient_ids = list(Ingredient.objects.values_list('id', flat=True))
+        self.ingredient_prefixes = [
+            name[: rng.randint(2, 4)]
+            for name in Ingredient.objects.values_list('name', flat=True)[:500]
+        ]
+        self.image_data = get_image_data()
+
+    def recipe_feed(self, rng):
+        tags = '&'.join(f'tags={slug}' for slug in rng.sample(self.tag_slugs, 2))
+        return self.client.get(
+            f'/api/recipes/?page={rng.randint(1, 20)}&limit=6&{tags}'
+        )
+
+    def recipe_feed_cursor(self, rng):
+        return self.client.get('/api/recipes/?pagination=cursor&limit=6')
+
+    def recipe_detail(self, rng):
+        return self.client.get(f'/api/recipes/{rng.choice(self.recipe_ids)}/')
+
+    def create_recipe(self, rng):
+        response = self.client.post(
+            '/api/recipes/',
+            data=json.dumps(
+                {
+                    'name': 'Рецепт для замера',
+                    'text': 'Описание',
+                    'cooking_time': rng.randint(5, 60),
+                    'image': self.image_data,
+                    'tags': [rng.choice(self.tag_ids)],
+                    'ingredients': [
+                        {'id': ingredient_id, 'amount': rng.randint(1, 500)}
+                        for ingredient_id in rng.sample(self.ingredient_ids, 10)
+                    ],
+                }
+            ),
+            content_type='application/json',
+        )
+        return response
+
+    def subscriptions(self, rng):
+        return self.client.get('/api/users/subscriptions/?limit=6&recipes_limit=3')
+
+    def subscription_feed(self, rng):
+        return self.client.get('/api/recipes/feed/?limit=6')
+
+    def download_cart(self, rng):
+        return self.client.get('/api/recipes/download_shopping_cart/')
+
+    def ingredient_autocomplete(self, rng):
+        name = rng.choice(self.ingredient_prefixes)
+        return self.client.get('/api/ingredients/', {'name': name, 'limit': 10})
+
+    def run_scenario(self, name, rng, requests, warmup):
+        scenario = getattr(self, name)
+        for _ in range(warmup):
+            response = scenario(rng)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        latencies, query_counts, errors = [], [], 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as queries:
+                request_started = time.perf_counter()
+                response = scenario(rng)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            query_counts.append(len(queries))
+            if response.status_code >= 400:
+                errors += 1
+        elapsed = time.perf_counter() - started
+        return {
+            'requests': requests,
+            'errors': errors,
+            'throughput_rps': round(requests / elapsed, 1),
+            'latency_ms': {
+                'mean': round(statistics.mean(latencies), 2),
+                'p50': round(percentile(latencies, 0.5), 2),
+                'p90': round(percentile(latencies, 0.9), 2),
+                'p95': round(percentile(latencies, 0.95), 2),
+                'p99': round(percentile(latencies, 0.99), 2),
+                'max': round(max(latencies), 2),
+            },
+            'queries': {
+                'mean': round(statistics.mean(query_counts), 2),
+                'max': max(query_counts),
+            },
+        }
+
+    def compare(self, report, path):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)['scenarios']
+        for name, result in report['scenarios'].items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            self.stderr.write(
+                f'{name}: rps {before["throughput_rps"]} -> {result["throughput_rps"]}, '
+                f'p95 {before["latency_ms"]["p95"]} -> {result["latency_ms"]["p95"]} мс, '
+                f'запросов {before["queries"]["mean"]} -> {result["queries"]["mean"]}'
+            )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self.setup(rng)
+            report = {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'rows': {
+                    'users': User.objects.count(),
+                    'recipes': Recipe.objects.count(),
+                    'ingredients': len(self.ingredient_ids),
+                },
+                'scenarios': {},
+            }
+            for name in options['scenario'] or SCENARIOS:
+                report['scenarios'][name] = self.run_scenario(
+                    name, rng, options['requests'], options['warmup']
+                )
+            transaction.set_rollback(True)
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
+        if options['compare']:
+            self.compare(report, options['compare'])
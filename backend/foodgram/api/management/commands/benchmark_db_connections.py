@@ -0,0 +1,91 @@
+import json
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from .benchmark_api import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет накладные расходы на подключение к БД в цикле запроса '
+        'без постоянных соединений и с CONN_MAX_AGE'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--conn-max-age', type=int, default=60)
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+
+    def run_mode(self, conn_max_age, health_checks, requests, health_check_idle=0):
+        connection.close()
+        settings_dict = connection.settings_dict
+        saved = settings_dict.copy()
+        settings_dict['CONN_MAX_AGE'] = conn_max_age
+        settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+        settings_dict['CONN_HEALTH_CHECK_IDLE'] = health_check_idle
+        connections_opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            connections_opened.append(connection.alias)
+
+        connection_created.connect(count_connection)
+        latencies = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                request_started.send(sender=self.__class__)
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                request_finished.send(sender=self.__class__)
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.close()
+            settings_dict.clear()
+            settings_dict.update(saved)
+        return {
+            'conn_max_age': conn_max_age,
+            'health_checks': health_checks,
+            'health_check_idle': health_check_idle,
+            'connections_opened': len(connections_opened),
+            'latency_ms': {
+                'mean': round(statistics.mean(latencies), 3),
+                'p50': round(percentile(latencies, 0.5), 3),
+                'p95': round(percentile(latencies, 0.95), 3),
+                'max': round(max(latencies), 3),
+            },
+        }
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        conn_max_age = options['conn_max_age']
+        report = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': requests,
+            'modes': {
+                'per_request': self.run_mode(0, False, requests),
+                'persistent': self.run_mode(conn_max_age, False, requests),
+                'persistent_health_checks': self.run_mode(conn_max_age, True, requests),
+                'persistent_idle_health_checks': self.run_mode(
+                    conn_max_age,
+                    True,
+                    requests,
+                    connection.settings_dict['CONN_HEALTH_CHECK_IDLE'],
+                ),
+            },
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,100 @@
+import json
+import statistics
+import time
+from io import BytesIO
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from recipes.models import Recipe
+from users.models import User
+
+from ...parsers import ORJSONParser, orjson
+from ...renderers import ORJSONRenderer
+from ...views import RecipeViewSet
+from .benchmark_api import BENCHMARK_HOST, percentile
+
+PAGE_SIZES = (6, 50, 200)
+RENDERERS = {'json': JSONRenderer, 'orjson': ORJSONRenderer}
+PARSERS = {'json': JSONParser, 'orjson': ORJSONParser}
+
+
+def get_recipe_page(user, limit):
+    request = APIRequestFactory().get(
+        '/api/recipes/', {'limit': limit}, HTTP_HOST=BENCHMARK_HOST
+    )
+    force_authenticate(request, user=user)
+    response = RecipeViewSet.as_view({'get': 'list'})(request)
+    return response.data
+
+
+def measure(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость JSON-рендерера и парсера DRF на стандартном json '
+        'и на orjson для страниц рецептов разного размера'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--page-size', type=int, action='append')
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson не установлен, сравнивать не с чем')
+        user = User.objects.filter(recipes_count__gt=0).first()
+        if user is None or not Recipe.objects.exists():
+            raise CommandError('Нет данных для замеров, сначала выполните seed_data')
+        report = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'django': django.get_version(),
+            'orjson': orjson.__version__,
+            'iterations': options['iterations'],
+            'pages': {},
+        }
+        for limit in options['page_size'] or PAGE_SIZES:
+            data = get_recipe_page(user, limit)
+            content = JSONRenderer().render(data)
+            if ORJSONRenderer().render(data) != content:
+                raise CommandError(f'Рендереры расходятся на странице из {limit}')
+            page = {'recipes': len(data['results']), 'bytes': len(content)}
+            for name, renderer_class in RENDERERS.items():
+                renderer = renderer_class()
+                page[f'render_{name}'] = measure(
+                    lambda: renderer.render(data), options['iterations']
+                )
+            for name, parser_class in PARSERS.items():
+                parser = parser_class()
+                page[f'parse_{name}'] = measure(
+                    lambda: parser.parse(BytesIO(content)), options['iterations']
+                )
+            page['render_speedup'] = round(
+                page['render_json']['mean_ms'] / page['render_orjson']['mean_ms'], 2
+            )
+            page['parse_speedup'] = round(
+                page['parse_json']['mean_ms'] / page['parse_orjson']['mean_ms'], 2
+            )
+            report['pages'][limit] = page
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
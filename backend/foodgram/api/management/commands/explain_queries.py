@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.models import Recipe
+from users.models import User
+
+from ...explain import get_full_scans, get_hot_queries
+
+
+class Command(BaseCommand):
+    help = 'Показывает планы выполнения основных запросов API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Завершиться с ошибкой, если горячие таблицы читаются полным сканом',
+        )
+        parser.add_argument('--verbose-plans', action='store_true')
+
+    def handle(self, *args, **options):
+        if not Recipe.objects.exists() or not User.objects.exists():
+            raise CommandError('База пуста, сначала выполните seed_data')
+        failures = []
+        for name, queryset in get_hot_queries().items():
+            plan = queryset.explain()
+            full_scans = get_full_scans(plan)
+            status = 'FULL SCAN ' + ', '.join(full_scans) if full_scans else 'ok'
+            self.stdout.write(f'{name}: {status}')
+            if options['verbose_plans'] or full_scans:
+                self.stdout.write(plan)
+            if full_scans:
+                failures.append(name)
+        if failures and options['strict']:
+            raise CommandError(f'Полный скан в запросах: {", ".join(failures)}')
@@ -0,0 +1,62 @@
+import glob
+import json
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from .benchmark_api import percentile
+
+
+class Command(BaseCommand):
+    help = 'Сводка по количеству и времени SQL-запросов для каждого view'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Вывести отчёт в JSON')
+        parser.add_argument(
+            '--reset', action='store_true', help='Удалить накопленную статистику'
+        )
+
+    def handle(self, *args, **options):
+        paths = glob.glob(
+            os.path.join(settings.QUERY_PROFILING['REPORT_DIR'], '*.json')
+        )
+        if options['reset']:
+            for path in paths:
+                os.remove(path)
+            self.stdout.write(f'Удалено файлов статистики: {len(paths)}')
+            return
+
+        samples = defaultdict(list)
+        for path in paths:
+            with open(path) as report_file:
+                for view_name, items in json.load(report_file).items():
+                    samples[view_name].extend(items)
+
+        report = {}
+        for view_name, items in sorted(samples.items()):
+            queries, db_ms, total_ms, repeated = zip(*items)
+            report[view_name] = {
+                'samples': len(items),
+                'queries_p50': percentile(queries, 0.5),
+                'queries_p95': percentile(queries, 0.95),
+                'queries_max': max(queries),
+                'db_ms_p50': round(percentile(db_ms, 0.5), 1),
+                'db_ms_p95': round(percentile(db_ms, 0.95), 1),
+                'total_ms_p50': round(percentile(total_ms, 0.5), 1),
+                'total_ms_p95': round(percentile(total_ms, 0.95), 1),
+                'repeated_queries': sum(1 for count in repeated if count),
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for view_name, row in report.items():
+            self.stdout.write(
+                f'{view_name}: {row["samples"]} запросов к view, '
+                f'SQL p50/p95/max {row["queries_p50"]}/{row["queries_p95"]}/'
+                f'{row["queries_max"]}, БД p50/p95 {row["db_ms_p50"]}/'
+                f'{row["db_ms_p95"]} мс, всего p50/p95 {row["total_ms_p50"]}/'
+                f'{row["total_ms_p95"]} мс, с повторами {row["repeated_queries"]}'
+            )
@@ -0,0 +1,147 @@
+import atexit
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+SQL_LIST_PATTERN = re.compile(r'%s(?:, %s)+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCollector:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[SQL_LIST_PATTERN.sub('%s, ...', sql)] += 1
+
+
+class QueryStats:
+    def __init__(self):
+        self.samples = defaultdict(deque)
+        self.unflushed = 0
+        self.lock = threading.Lock()
+        self.flusher = None
+
+    def record(self, view_name, sample):
+        options = settings.QUERY_PROFILING
+        with self.lock:
+            history = self.samples[view_name]
+            history.append(sample)
+            while len(history) > options['HISTORY_SIZE']:
+                history.popleft()
+            self.unflushed += 1
+            if self.flusher is None:
+                self.flusher = threading.Thread(
+                    target=self.flush_periodically, daemon=True
+                )
+                self.flusher.start()
+                atexit.register(self.flush)
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(settings.QUERY_PROFILING['FLUSH_INTERVAL'])
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.unflushed:
+                return
+            report = {name: list(items) for name, items in self.samples.items()}
+            self.unflushed = 0
+        report_dir = settings.QUERY_PROFILING['REPORT_DIR']
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f'{os.getpid()}.json')
+        with open(f'{path}.tmp', 'w') as report_file:
+            json.dump(report, report_file)
+        os.replace(f'{path}.tmp', path)
+
+
+query_stats = QueryStats()
+
+
+class QueryProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        options = settings.QUERY_PROFILING
+        if not options['ENFORCE_BUDGETS'] and random.random() >= options['SAMPLE_RATE']:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+
+        if response.streaming:
+            response.streaming_content = self.profile_streaming_content(
+                request, response.streaming_content, collector, start
+            )
+            return response
+        duration = self.finish(request, collector, start)
+        response['Server-Timing'] = (
+            f'db;dur={collector.duration * 1000:.1f};desc="{collector.count} queries", '
+            f'app;dur={duration * 1000:.1f}'
+        )
+        return response
+
+    def profile_streaming_content(self, request, streaming_content, collector, start):
+        try:
+            with connection.execute_wrapper(collector):
+                yield from streaming_content
+        finally:
+            self.finish(request, collector, start)
+
+    def finish(self, request, collector, start):
+        options = settings.QUERY_PROFILING
+        duration = time.perf_counter() - start
+        resolver_match = request.resolver_match
+        view_name = resolver_match.view_name if resolver_match else request.path
+        repeated = {
+            sql: count
+            for sql, count in collector.shapes.items()
+            if count >= options['REPEATED_QUERY_THRESHOLD']
+        }
+        query_stats.record(
+            view_name,
+            [
+                collector.count,
+                collector.duration * 1000,
+                duration * 1000,
+                len(repeated),
+            ],
+        )
+        for sql, count in repeated.items():
+            logger.warning('%s: запрос выполнен %s раз: %s', view_name, count, sql)
+
+        budget = options['BUDGETS'].get(view_name)
+        if budget is not None and collector.count > budget:
+            message = (
+                f'{view_name}: выполнено {collector.count} запросов '
+                f'при бюджете {budget}'
+            )
+            if options['ENFORCE_BUDGETS']:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return duration
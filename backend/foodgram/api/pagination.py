@@ -4,3 +4,9 @@ from rest_framework import pagination
 class RecipePagination(pagination.PageNumberPagination):
     page_size = 6
     page_size_query_param = 'limit'
+
+
+class RecipeCursorPagination(pagination.CursorPagination):
+    page_size = 6
+    page_size_query_param = 'limit'
+    ordering = '-id'
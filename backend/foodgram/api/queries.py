@@ -0,0 +1,80 @@
+from django.db import connection
+from django.db.models import BooleanField, Exists, F, OuterRef, Value, Window
+from django.db.models.functions import RowNumber
+
+from recipes.models import FavouriteRecipe, Recipe
+from shopping_cart.models import ShoppingListItem, ShoppingOrder
+from shopping_cart.shopping_list import sum_in_base_units
+
+
+def annotate_user_flags(recipe_query, user):
+    if user.is_anonymous:
+        return recipe_query.annotate(
+            is_favorited=Value(False, output_field=BooleanField()),
+            is_in_shopping_cart=Value(False, output_field=BooleanField()),
+        )
+    return recipe_query.annotate(
+        is_favorited=Exists(
+            FavouriteRecipe.objects.filter(user=user, recipe=OuterRef('pk'))
+        ),
+        is_in_shopping_cart=Exists(
+            ShoppingOrder.objects.filter(user=user, recipe=OuterRef('pk'))
+        ),
+    )
+
+
+def get_shopping_cart_query(user, units='recipe'):
+    items = ShoppingListItem.objects.filter(user=user)
+    if units == 'base':
+        return sum_in_base_units(items)
+    return items.values(
+        'amount',
+        name=F('ingredient__name'),
+        measurement_unit=F('ingredient__measurement_unit'),
+    ).order_by('name')
+
+
+def get_shopping_cart_ingredients(user, units='recipe'):
+    ingredients = get_shopping_cart_query(user, units).iterator()
+    if units == 'base':
+        return (
+            {
+                'name': item['name'],
+                'amount': int(item['total'])
+                if item['total'].is_integer()
+                else item['total'],
+                'measurement_unit': item['measurement_unit'],
+            }
+            for item in ingredients
+        )
+    return ingredients
+
+
+def get_recent_recipes(author_ids, limit=None):
+    recipe_query = Recipe.objects.filter(author__in=author_ids).values(
+        'id', 'name', 'image', 'cooking_time', 'author_id'
+    )
+    if limit is None:
+        recipes = recipe_query.order_by('-id')
+    else:
+        ranked_query = recipe_query.annotate(
+            recipe_rank=Window(
+                expression=RowNumber(),
+                partition_by=F('author'),
+                order_by=F('id').desc(),
+            )
+        ).order_by()
+        sql, params = ranked_query.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT id, name, image, cooking_time, author_id '
+                f'FROM ({sql}) ranked_recipes '
+                'WHERE recipe_rank <= %s ORDER BY id DESC',
+                (*params, limit),
+            )
+            columns = [column[0] for column in cursor.description]
+            recipes = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    recipes_by_author = {author_id: [] for author_id in author_ids}
+    for recipe in recipes:
+        recipes_by_author[recipe.pop('author_id')].append(recipe)
+    return recipes_by_author
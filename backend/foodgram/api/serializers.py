@@ -1,11 +1,14 @@
 import collections.abc
 
+from django.core.files.storage import default_storage
+from django.db import transaction
 from djoser.serializers import (
     UserCreateSerializer as BaseDjoserUserCreateSerializer,
 )
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from recipes.images import get_image_variant_names
 from recipes.models import (
     FavouriteRecipe,
     Ingredient,
@@ -13,7 +16,10 @@ from recipes.models import (
     RecipeIngredient,
     Tag,
 )
+from recipes.search import update_search_documents
+from recipes.tasks import schedule_image_variants
 from shopping_cart.models import ShoppingOrder
+from shopping_cart.shopping_list import get_recipe_shoppers, update_shopping_lists
 from users.models import Follow, User
 
 from .fields import RecipeImageField
@@ -28,6 +34,9 @@ class UserSerializer(serializers.ModelSerializer):
             return False
         if current_user.is_anonymous:
             return False
+        subscribed_author_ids = self.context.get('subscribed_author_ids')
+        if subscribed_author_ids is not None:
+            return instance.id in subscribed_author_ids
         return instance.following.filter(user=current_user).exists()
 
     class Meta:
@@ -96,23 +105,79 @@ class IngredientRecipeSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
+def get_ingredient_amounts(ingredients_data):
+    amounts = {}
+    for item in ingredients_data:
+        try:
+            ingredient_id = int(item.get('id'))
+            amount = int(item.get('amount'))
+        except (AttributeError, TypeError, ValueError):
+            raise ValidationError(detail='Передан невалидный список ингредиентов')
+        if amount < 1:
+            raise ValidationError(
+                detail='Количество ингредиента должно быть больше нуля'
+            )
+        if ingredient_id in amounts:
+            raise ValidationError(detail='Ингредиенты в рецепте не должны повторяться')
+        amounts[ingredient_id] = amount
+    missing_ids = set(amounts) - set(Ingredient.objects.in_bulk(list(amounts)))
+    if missing_ids:
+        raise ValidationError(
+            detail=f'Ингредиенты не найдены: {", ".join(map(str, sorted(missing_ids)))}'
+        )
+    return amounts
+
+
 def add_recipe_tags_ingredients(recipe_instance, tag_ids=None, ingredients_data=None):
     if tag_ids is not None:
         tags = Tag.objects.filter(pk__in=tag_ids)
         recipe_instance.tags.set(tags)
 
     if ingredients_data is not None:
-        for item in ingredients_data:
-            ingredient_instance = Ingredient.objects.get(pk=item.get('id'))
-            recipe_instance.ingredients.add(
-                ingredient_instance,
-                through_defaults={'amount': item.get('amount')},
+        amounts = get_ingredient_amounts(ingredients_data)
+        current_items = {
+            item.ingredient_id: item
+            for item in RecipeIngredient.objects.filter(recipe=recipe_instance)
+        }
+        removed_ids = set(current_items) - set(amounts)
+        if removed_ids:
+            RecipeIngredient.objects.filter(
+                recipe=recipe_instance, ingredient__in=removed_ids
+            ).delete()
+        changed_items = []
+        shopping_list_changes = {
+            ingredient_id: amount - current_items[ingredient_id].amount
+            if ingredient_id in current_items
+            else amount
+            for ingredient_id, amount in amounts.items()
+        }
+        for ingredient_id, item in current_items.items():
+            amount = amounts.get(ingredient_id)
+            if amount is not None and item.amount != amount:
+                item.amount = amount
+                changed_items.append(item)
+        RecipeIngredient.objects.bulk_update(changed_items, ['amount'])
+        RecipeIngredient.objects.bulk_create(
+            [
+                RecipeIngredient(
+                    recipe=recipe_instance,
+                    ingredient_id=ingredient_id,
+                    amount=amount,
+                )
+                for ingredient_id, amount in amounts.items()
+                if ingredient_id not in current_items
+            ]
+        )
+        if current_items:
+            update_shopping_lists(
+                get_recipe_shoppers(recipe_instance.pk), shopping_list_changes
             )
     return recipe_instance
 
 
 class RecipeSerializer(serializers.ModelSerializer):
     image = RecipeImageField(max_length=None, use_url=True)
+    image_variants = serializers.SerializerMethodField()
     author = UserSerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     ingredients = IngredientRecipeSerializer(
@@ -150,36 +215,64 @@ class RecipeSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         raw_data = self.context['request'].data
-        recipe_instance = Recipe.objects.create(**validated_data)
-        return add_recipe_tags_ingredients(
-            recipe_instance=recipe_instance,
-            tag_ids=raw_data.get('tags'),
-            ingredients_data=raw_data.get('ingredients'),
-        )
+        with transaction.atomic():
+            recipe_instance = Recipe.objects.create(**validated_data)
+            add_recipe_tags_ingredients(
+                recipe_instance=recipe_instance,
+                tag_ids=raw_data.get('tags'),
+                ingredients_data=raw_data.get('ingredients'),
+            )
+            update_search_documents([recipe_instance.pk])
+            schedule_image_variants(recipe_instance.image.name)
+        return recipe_instance
 
     def update(self, instance, validated_data):
         raw_data = self.context['request'].data
+        image_name = instance.image.name
         instance.name = validated_data.get('name', instance.name)
         instance.text = validated_data.get('text', instance.text)
         instance.image = validated_data.get('image', instance.image)
+        image_changed = instance.image.name != image_name
+        if image_changed:
+            instance.ready_image_variants = ''
         instance.cooking_time = validated_data.get(
             'cooking_time', instance.cooking_time
         )
-        add_recipe_tags_ingredients(
-            recipe_instance=instance,
-            tag_ids=raw_data.get('tags'),
-            ingredients_data=raw_data.get('ingredients'),
-        )
-        instance.save()
+        with transaction.atomic():
+            add_recipe_tags_ingredients(
+                recipe_instance=instance,
+                tag_ids=raw_data.get('tags'),
+                ingredients_data=raw_data.get('ingredients'),
+            )
+            instance.save()
+            update_search_documents([instance.pk])
+            if image_changed:
+                schedule_image_variants(instance.image.name)
         return instance
 
+    def get_image_variants(self, obj):
+        request = self.context.get('request')
+        return {
+            variant: {
+                extension: request.build_absolute_uri(default_storage.url(name))
+                for extension, name in names.items()
+            }
+            for variant, names in get_image_variant_names(
+                obj.image.name, obj.ready_image_variants
+            ).items()
+        }
+
     def get_is_favorited(self, obj):
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         user = self.context.get('request').user
         if user.is_anonymous:
             return False
         return user.favourites.filter(recipe=obj.id).exists()
 
     def get_is_in_shopping_cart(self, obj):
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
         user = self.context.get('request').user
         if user.is_anonymous:
             return False
@@ -188,7 +281,13 @@ class RecipeSerializer(serializers.ModelSerializer):
     class Meta:
         ordering = ('-id',)
         model = Recipe
-        fields = '__all__'
+        exclude = (
+            'favourites_count',
+            'modified',
+            'ready_image_variants',
+            'search_document',
+            'search_vector',
+        )
 
 
 class FollowSerializer(serializers.ModelSerializer):
@@ -204,30 +303,26 @@ class FollowSerializer(serializers.ModelSerializer):
         return data
 
     def to_representation(self, instance):
-        recipe_instances = instance.author.recipes.filter(
-            author=instance.author.id,
-        ).order_by('-id')
-        recipes_limit = self.context['request'].query_params.get('recipes_limit', None)
-        if recipes_limit is not None:
-            recipe_instances = recipe_instances[: int(recipes_limit)]
-        recipes = []
-        for recipe in recipe_instances.values('id', 'name', 'image', 'cooking_time'):
-            recipes.append(
-                {
-                    'id': recipe.get('id'),
-                    'name': recipe.get('name'),
-                    'image': recipe.get('image'),
-                    'cooking_time': recipe.get('cooking_time'),
-                }
+        recipes_by_author = self.context.get('recipes_by_author')
+        if recipes_by_author is not None:
+            recipes = recipes_by_author.get(instance.author_id, [])
+        else:
+            recipe_instances = instance.author.recipes.order_by('-id')
+            recipes_limit = self.context['request'].query_params.get(
+                'recipes_limit', None
+            )
+            if recipes_limit is not None:
+                recipe_instances = recipe_instances[: int(recipes_limit)]
+            recipes = list(
+                recipe_instances.values('id', 'name', 'image', 'cooking_time')
             )
-
         return {
             'id': instance.author.id,
             'email': instance.author.email,
             'username': instance.author.username,
             'first_name': instance.author.first_name,
             'last_name': instance.author.last_name,
-            'recipes_count': instance.author.recipes.count(),
+            'recipes_count': instance.author.recipes_count,
             'is_subscribed': True,
             'recipes': recipes,
         }
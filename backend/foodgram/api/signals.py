@@ -0,0 +1,58 @@
+import time
+
+from django.core.signals import request_finished, request_started
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.authtoken.models import Token
+
+from users.models import User
+
+from .authentication import invalidate_tokens, invalidate_user
+from .cache import invalidate_recipe_responses
+
+
+AUTHOR_FIELDS = {'username', 'email', 'first_name', 'last_name'}
+
+
+def invalidate_author_recipe_responses(sender, created, update_fields, **kwargs):
+    if created or (update_fields is not None and not AUTHOR_FIELDS & update_fields):
+        return
+    transaction.on_commit(invalidate_recipe_responses)
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+def invalidate_deleted_token(sender, instance, **kwargs):
+    key = instance.key
+    transaction.on_commit(lambda: invalidate_tokens([key]))
+
+
+def mark_connections_idle(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        connection.idle_since = now
+
+
+def close_unhealthy_connections(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        settings_dict = connection.settings_dict
+        if (
+            settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.connection is not None
+            and now - getattr(connection, 'idle_since', now)
+            >= settings_dict.get('CONN_HEALTH_CHECK_IDLE', 0)
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+request_started.connect(close_unhealthy_connections)
+request_finished.connect(mark_connections_idle)
+post_save.connect(invalidate_author_recipe_responses, sender=User)
+post_save.connect(invalidate_cached_user, sender=User)
+post_delete.connect(invalidate_cached_user, sender=User)
+post_delete.connect(invalidate_deleted_token, sender=Token)
@@ -1,18 +1,46 @@
-from django.db.models import Sum
-from django.http import HttpResponse
+import abc
+import hashlib
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import BooleanField, Exists, OuterRef, Prefetch, Value
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from recipes.models import FavouriteRecipe, Ingredient, Recipe, Tag
+from recipes.cache import reference_data
+from recipes.feed import FeedRecipes, backfill_feed, remove_from_feed
+from recipes.models import (
+    FavouriteRecipe,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    Tag,
+)
+from recipes.search import search_recipes
+from recipes.tasks import schedule_fan_out
 from shopping_cart.models import ShoppingOrder
 from users.models import Follow
 
-from .filters import IngredientFilter, RecipeFilter
+from .cache import get_cached_response, invalidate_recipe_responses
+from .exports import SHOPPING_CART_FORMATS
+from .filters import RecipeFilter
+from .forms import IngredientSearchForm
+from .pagination import RecipeCursorPagination
 from .permissions import IsOwnerOrReadOnly
+from .queries import (
+    annotate_user_flags,
+    get_recent_recipes,
+    get_shopping_cart_ingredients,
+)
 from .serializers import (
     FavouriteSerializer,
     FollowSerializer,
@@ -23,20 +51,130 @@ from .serializers import (
 )
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Tag.objects.all()
-    serializer_class = TagSerializer
+def reference_data_etag(request, *args, **kwargs):
+    return f'"reference-{reference_data.get_version()}"'
+
+
+def reference_data_last_modified(request, *args, **kwargs):
+    return datetime.utcfromtimestamp(reference_data.get_version() / 10**9)
+
+
+def get_recipe_validators(request, pk):
+    if not hasattr(request, 'recipe_validators'):
+        try:
+            pk = int(pk)
+        except ValueError:
+            request.recipe_validators = (None, None)
+            return request.recipe_validators
+        user = request.user
+        recipe_query = annotate_user_flags(Recipe.objects.filter(pk=pk), user)
+        if user.is_anonymous:
+            recipe_query = recipe_query.annotate(
+                is_subscribed=Value(False, output_field=BooleanField())
+            )
+        else:
+            recipe_query = recipe_query.annotate(
+                is_subscribed=Exists(
+                    Follow.objects.filter(user=user, author=OuterRef('author'))
+                )
+            )
+        values = recipe_query.values_list(
+            'modified',
+            'author__username',
+            'author__email',
+            'author__first_name',
+            'author__last_name',
+            'is_favorited',
+            'is_in_shopping_cart',
+            'is_subscribed',
+        ).first()
+        if values is None:
+            request.recipe_validators = (None, None)
+        else:
+            state = repr((user.id, reference_data.get_version()) + values)
+            request.recipe_validators = (
+                f'"recipe-{hashlib.md5(state.encode()).hexdigest()}"',
+                values[0] if user.is_anonymous else None,
+            )
+    return request.recipe_validators
+
+
+def recipe_etag(request, pk, *args, **kwargs):
+    return get_recipe_validators(request, pk)[0]
+
+
+def recipe_last_modified(request, pk, *args, **kwargs):
+    return get_recipe_validators(request, pk)[1]
+
+
+SHOPPING_CART_UNITS = ('recipe', 'base')
+
+
+def get_shopping_cart_units(request):
+    units = request.query_params.get('units', 'recipe')
+    if units not in SHOPPING_CART_UNITS:
+        raise ValidationError(
+            detail=f'Неизвестный режим единиц измерения: {units}. '
+            f'Доступные режимы: {", ".join(SHOPPING_CART_UNITS)}'
+        )
+    return units
+
+
+class ReferenceDataViewSet(viewsets.ReadOnlyModelViewSet, metaclass=abc.ABCMeta):
     permission_classes = (AllowAny,)
     pagination_class = None
 
+    @abc.abstractmethod
+    def get_cached_object(self, pk):
+        pass
+
+    @abc.abstractmethod
+    def get_cached_list(self):
+        pass
+
+    def get_object(self):
+        try:
+            instance = self.get_cached_object(int(self.kwargs[self.lookup_field]))
+        except ValueError:
+            instance = None
+        if instance is None:
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    @method_decorator(condition(reference_data_etag, reference_data_last_modified))
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_cached_list(), many=True)
+        return Response(serializer.data)
+
+    @method_decorator(condition(reference_data_etag, reference_data_last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        return super(ReferenceDataViewSet, self).retrieve(request, *args, **kwargs)
+
+
+class TagViewSet(ReferenceDataViewSet):
+    queryset = Tag.objects.all()
+    serializer_class = TagSerializer
+
+    def get_cached_object(self, pk):
+        return reference_data.get_tag(pk)
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+    def get_cached_list(self):
+        return reference_data.get_tags()
+
+
+class IngredientViewSet(ReferenceDataViewSet):
     queryset = Ingredient.objects.select_related('measurement_unit').all()
     serializer_class = IngredientSerializer
-    permission_classes = (AllowAny,)
-    pagination_class = None
-    filter_backends = (DjangoFilterBackend,)
-    filterset_class = IngredientFilter
+
+    def get_cached_object(self, pk):
+        return reference_data.get_ingredient(pk)
+
+    def get_cached_list(self):
+        form = IngredientSearchForm(self.request.query_params)
+        if not form.is_valid():
+            raise ValidationError(form.errors)
+        return reference_data.search_ingredients(**form.cleaned_data)
 
 
 class RecipeViewSet(viewsets.ModelViewSet):
@@ -44,18 +182,88 @@ class RecipeViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
 
+    def get_recipe_query(self):
+        recipe_query = Recipe.objects.select_related('author').prefetch_related(
+            'tags',
+            Prefetch(
+                'recipeingredient_set',
+                queryset=RecipeIngredient.objects.select_related('ingredient'),
+            ),
+        )
+        return annotate_user_flags(recipe_query, self.request.user)
+
     def get_queryset(self):
-        user = self.request.user
         query_params = self.request.query_params
         is_favorited = query_params.get('is_favorited', None)
         is_in_shopping_cart = query_params.get('is_in_shopping_cart', None)
-        recipe_query = Recipe.objects.select_related('author')
+        recipe_query = self.get_recipe_query()
         if is_favorited is not None:
-            return recipe_query.filter(favourites__user=user)
+            return recipe_query.filter(is_favorited=True)
         elif is_in_shopping_cart is not None:
-            return recipe_query.filter(shopping_orders__user=user)
+            return recipe_query.filter(is_in_shopping_cart=True)
         return recipe_query.all()
 
+    def filter_queryset(self, queryset):
+        queryset = super(RecipeViewSet, self).filter_queryset(queryset)
+        search = self.request.query_params.get('search')
+        if search and self.action == 'list':
+            return search_recipes(queryset, search)
+        return queryset
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            query_params = self.request.query_params
+            if self.action == 'feed' or (
+                query_params.get('pagination') == 'cursor'
+                and 'search' not in query_params
+            ):
+                self._paginator = RecipeCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    @method_decorator(vary_on_headers('Authorization'))
+    def list(self, request, *args, **kwargs):
+        return get_cached_response(
+            super(RecipeViewSet, self).list, request, *args, **kwargs
+        )
+
+    @method_decorator(vary_on_headers('Authorization'))
+    @method_decorator(condition(recipe_etag, recipe_last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        return get_cached_response(
+            super(RecipeViewSet, self).retrieve, request, *args, **kwargs
+        )
+
+    def get_subscribed_author_ids(self, recipes):
+        user = self.request.user
+        if user.is_anonymous:
+            return set()
+        return set(
+            Follow.objects.filter(
+                user=user,
+                author__in={recipe.author_id for recipe in recipes},
+            ).values_list('author_id', flat=True)
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super(RecipeViewSet, self).paginate_queryset(queryset)
+        recipes = page if page is not None else queryset
+        self.subscribed_author_ids = self.get_subscribed_author_ids(recipes)
+        return page
+
+    def get_object(self):
+        instance = super(RecipeViewSet, self).get_object()
+        self.subscribed_author_ids = self.get_subscribed_author_ids([instance])
+        return instance
+
+    def get_serializer_context(self):
+        context = super(RecipeViewSet, self).get_serializer_context()
+        if hasattr(self, 'subscribed_author_ids'):
+            context['subscribed_author_ids'] = self.subscribed_author_ids
+        return context
+
     def get_permissions(self):
         if self.action in ['partial_update', 'destroy']:
             self.permission_classes = (IsOwnerOrReadOnly,)
@@ -63,8 +271,25 @@ class RecipeViewSet(viewsets.ModelViewSet):
             self.permission_classes = (IsAuthenticated,)
         return super(self.__class__, self).get_permissions()
 
+    def get_saved_instance(self, instance):
+        self.subscribed_author_ids = self.get_subscribed_author_ids([instance])
+        return self.get_queryset().get(pk=instance.pk)
+
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        with transaction.atomic():
+            serializer.save(author=self.request.user)
+            schedule_fan_out(serializer.instance)
+        invalidate_recipe_responses()
+        serializer.instance = self.get_saved_instance(serializer.instance)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_recipe_responses()
+        serializer.instance = self.get_saved_instance(serializer.instance)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_recipe_responses()
 
     @action(
         detail=True,
@@ -80,7 +305,8 @@ class RecipeViewSet(viewsets.ModelViewSet):
             }
             serializer = FavouriteSerializer(data=data)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             headers = self.get_success_headers(serializer.data)
             return Response(
                 serializer.data,
@@ -93,7 +319,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 user=self.request.user,
                 recipe=kwargs.get('pk'),
             )
-            self.perform_destroy(instance)
+            instance.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -103,20 +329,49 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,),
     )
     def download_shopping_cart(self, request, *args, **kwargs):
-        user = request.user
-        try:
-            shopping_recipes = Recipe.objects.filter(shopping_orders__user=user)
-            ingredients = shopping_recipes.values_list(
-                'recipeingredient__ingredient__name',
-                'recipeingredient__ingredient__measurement_unit',
-            ).order_by('recipeingredient__ingredient__name')
-            total = ingredients.annotate(amount=Sum('recipeingredient__amount'))
-            shopping_cart = 'Список ингредиентов для покупки:'
-            for index, ingredient in enumerate(total):
-                shopping_cart += f'\n- {ingredient[0]}: {ingredient[2]} {ingredient[1]}'
-            return HttpResponse(shopping_cart, content_type='text/plain')
-        except:
-            raise Exception('Список покупок пуст')
+        file_format = request.query_params.get('file_format', 'txt')
+        if file_format not in SHOPPING_CART_FORMATS:
+            raise ValidationError(
+                detail=f'Неизвестный формат файла: {file_format}. '
+                f'Доступные форматы: {", ".join(SHOPPING_CART_FORMATS)}'
+            )
+        export, content_type = SHOPPING_CART_FORMATS[file_format]
+        ingredients = get_shopping_cart_ingredients(
+            request.user, get_shopping_cart_units(request)
+        )
+        response = StreamingHttpResponse(export(ingredients), content_type=content_type)
+        response[
+            'Content-Disposition'
+        ] = f'attachment; filename="shopping_cart.{file_format}"'
+        return response
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='feed',
+        permission_classes=(IsAuthenticated,),
+    )
+    def feed(self, request, *args, **kwargs):
+        page = self.paginate_queryset(
+            FeedRecipes(request.user, self.get_recipe_query())
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='shopping_list',
+        permission_classes=(IsAuthenticated,),
+    )
+    def shopping_list(self, request, *args, **kwargs):
+        return Response(
+            list(
+                get_shopping_cart_ingredients(
+                    request.user, get_shopping_cart_units(request)
+                )
+            )
+        )
 
     @action(
         detail=True,
@@ -132,7 +387,8 @@ class RecipeViewSet(viewsets.ModelViewSet):
             }
             serializer = ShoppingCartSerializer(data=data)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             headers = self.get_success_headers(serializer.data)
             return Response(
                 serializer.data,
@@ -145,7 +401,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 user=self.request.user,
                 recipe=kwargs.get('pk'),
             )
-            self.perform_destroy(instance)
+            instance.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -158,7 +414,30 @@ class FollowListViewSet(
 
     def get_queryset(self):
         user = self.request.user
-        return Follow.objects.filter(user=user)
+        return Follow.objects.filter(user=user).select_related('author')
+
+    def get_recipes_limit(self):
+        recipes_limit = self.request.query_params.get('recipes_limit', None)
+        if recipes_limit is None:
+            return None
+        try:
+            return max(int(recipes_limit), 0)
+        except ValueError:
+            raise ValidationError(detail='recipes_limit должен быть целым числом')
+
+    def paginate_queryset(self, queryset):
+        page = super(FollowListViewSet, self).paginate_queryset(queryset)
+        follows = page if page is not None else queryset
+        self.recipes_by_author = get_recent_recipes(
+            [follow.author_id for follow in follows], self.get_recipes_limit()
+        )
+        return page
+
+    def get_serializer_context(self):
+        context = super(FollowListViewSet, self).get_serializer_context()
+        if hasattr(self, 'recipes_by_author'):
+            context['recipes_by_author'] = self.recipes_by_author
+        return context
 
 
 class FollowCreateDestroyViewSet(
@@ -186,6 +465,16 @@ class FollowCreateDestroyViewSet(
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            backfill_feed(self.request.user.pk, serializer.instance.author)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            remove_from_feed(instance.user_id, instance.author_id)
+
 
 class FavouriteCreateDestroyViewSet(
     mixins.CreateModelMixin,
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -24,11 +25,13 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'recipes.apps.RecipesConfig',
     'shopping_cart.apps.ShoppingCartConfig',
-    'api',
+    'api.apps.ApiConfig',
+    'tasks.apps.TasksConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.QueryProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,9 +68,27 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', ''),
         'PORT': os.getenv('DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'CONN_HEALTH_CHECK_IDLE': int(os.getenv('DB_CONN_HEALTH_CHECK_IDLE', 30)),
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_POOL_MODE') == 'pgbouncer',
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'foodgram'),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'foodgram'),
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', 300)),
+    }
+}
+
+RECIPE_RESPONSE_CACHE_TIMEOUT = int(os.getenv('RECIPE_RESPONSE_CACHE_TIMEOUT', 60))
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', 300))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,12 +122,37 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 AUTH_USER_MODEL = 'users.User'
 
+RECIPE_IMAGE_VARIANTS = {
+    'thumbnail': (480, 480),
+    'detail': (1200, 1200),
+}
+
+TASKS = {
+    'SYNC': os.getenv('TASKS_SYNC', 'False') == 'True',
+    'PROCESSES': int(os.getenv('TASKS_PROCESSES', 2)),
+    'POLL_INTERVAL': float(os.getenv('TASKS_POLL_INTERVAL', 1)),
+    'LOCK_TIMEOUT': 300,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 10,
+    'KEEP_FINISHED': 24 * 60 * 60,
+}
+
+FEED_MAX_LENGTH = int(os.getenv('FEED_MAX_LENGTH', 500))
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv('FEED_FANOUT_MAX_FOLLOWERS', 10000))
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.AllowAny',),
-    'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
-    ),
+    'DEFAULT_AUTHENTICATION_CLASSES': ('api.authentication.CachedTokenAuthentication',),
     'DEFAULT_PAGINATION_CLASS': 'api.pagination.RecipePagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'PAGE_SIZE': 6,
 }
 
@@ -135,6 +181,26 @@ LOGGING = {
     },
 }
 
+QUERY_PROFILING = {
+    'SAMPLE_RATE': float(os.getenv('QUERY_PROFILING_SAMPLE_RATE', 0)),
+    'REPORT_DIR': os.getenv(
+        'QUERY_PROFILING_REPORT_DIR',
+        os.path.join(tempfile.gettempdir(), 'foodgram-query-profile'),
+    ),
+    'HISTORY_SIZE': 1000,
+    'FLUSH_INTERVAL': 10,
+    'REPEATED_QUERY_THRESHOLD': 5,
+    'BUDGETS': {
+        'api:recipes-list': 8,
+        'api:recipes-detail': 8,
+        'api:recipes-feed': 6,
+        'api:tags-list': 3,
+        'api:ingredients-list': 3,
+        'api:subscriptions-list': 6,
+    },
+    'ENFORCE_BUDGETS': False,
+}
+
 DJOSER = {
     'LOGIN_FIELD': 'email',
     'HIDE_USERS': False,
@@ -10,6 +10,7 @@ from .models import (
     RecipeTag,
     Tag,
 )
+from .search import update_search_documents
 
 
 @admin.register(Tag)
@@ -75,18 +76,28 @@ class RecipeAdmin(admin.ModelAdmin):
     )
 
     def change_view(self, request, object_id, form_url='', extra_content=None):
-        in_favorites_count = FavouriteRecipe.objects.filter(recipe=object_id).count()
+        in_favorites_count = (
+            Recipe.objects.filter(pk=object_id)
+            .values_list('favourites_count', flat=True)
+            .first()
+        )
         context = {'in_favorites_count': in_favorites_count}
         return super(RecipeAdmin, self).change_view(
             request, object_id, form_url, context
         )
 
+    def save_related(self, request, form, formsets, change):
+        super(RecipeAdmin, self).save_related(request, form, formsets, change)
+        update_search_documents([form.instance.pk])
+
 
 @admin.register(MeasurementUnit)
 class MeasurementUnitAdmin(admin.ModelAdmin):
     list_display = (
         'id',
         'name',
+        'base_unit',
+        'factor',
     )
 
 
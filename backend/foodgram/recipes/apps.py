@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RecipesConfig(AppConfig):
     name = 'recipes'
     verbose_name = 'Рецепты и его состовляющие'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,115 @@
+import abc
+import bisect
+import threading
+import time
+
+from django.core.cache import cache
+
+from .models import Ingredient, Tag
+
+REFERENCE_DATA_VERSION_KEY = 'recipes:reference-data-version'
+
+
+def new_version():
+    return time.time_ns()
+
+
+def get_cache_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    cache.set(key, new_version(), timeout=None)
+
+
+class VersionedCache(abc.ABC):
+    version_key = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._data = None
+
+    def get_version(self):
+        return get_cache_version(self.version_key)
+
+    def invalidate(self):
+        bump_cache_version(self.version_key)
+
+    @abc.abstractmethod
+    def load(self):
+        pass
+
+    def reload(self, data):
+        return self.load()
+
+    def get_data(self):
+        version = self.get_version()
+        data = self._data
+        if data is not None and self._version == version:
+            return data
+        with self._lock:
+            if self._data is None:
+                self._data = self.load()
+            elif self._version != version:
+                self._data = self.reload(self._data)
+            self._version = version
+            return self._data
+
+
+class ReferenceDataCache(VersionedCache):
+    version_key = REFERENCE_DATA_VERSION_KEY
+
+    def load(self):
+        tags = list(Tag.objects.all())
+        ingredients = sorted(
+            Ingredient.objects.select_related('measurement_unit'),
+            key=lambda ingredient: (
+                ingredient.name.lower(),
+                ingredient.measurement_unit_id or '',
+            ),
+        )
+        return {
+            'tags': tags,
+            'tags_by_id': {tag.id: tag for tag in tags},
+            'ingredients': ingredients,
+            'ingredients_by_id': {
+                ingredient.id: ingredient for ingredient in ingredients
+            },
+            'ingredient_keys': [ingredient.name.lower() for ingredient in ingredients],
+        }
+
+    def get_tags(self):
+        return self.get_data()['tags']
+
+    def get_tag(self, pk):
+        return self.get_data()['tags_by_id'].get(pk)
+
+    def get_ingredient(self, pk):
+        return self.get_data()['ingredients_by_id'].get(pk)
+
+    def search_ingredients(self, name=None, limit=None):
+        data = self.get_data()
+        ingredients = data['ingredients']
+        if name:
+            keys = data['ingredient_keys']
+            value = name.lower()
+            start = bisect.bisect_left(keys, value)
+            end = start
+            while end < len(keys) and keys[end].startswith(value):
+                end += 1
+            ingredients = ingredients[start:end] + [
+                ingredient
+                for key, ingredient in zip(keys, ingredients)
+                if value in key and not key.startswith(value)
+            ]
+        if limit:
+            ingredients = ingredients[: int(limit)]
+        return ingredients
+
+
+reference_data = ReferenceDataCache()
@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+
+from users.models import Follow
+
+from .models import FeedItem, Recipe
+
+FEED_BATCH_SIZE = 500
+
+
+def is_pulled_author(author):
+    return author.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def trim_feeds(user_ids):
+    cutoff = (
+        FeedItem.objects.filter(user=OuterRef('user'))
+        .order_by('-recipe_id')
+        .values('recipe_id')[settings.FEED_MAX_LENGTH - 1 : settings.FEED_MAX_LENGTH]
+    )
+    FeedItem.objects.filter(user__in=user_ids, recipe_id__lt=Subquery(cutoff)).delete()
+
+
+def fan_out_recipe(recipe):
+    if is_pulled_author(recipe.author):
+        return
+    follower_ids = Follow.objects.filter(author=recipe.author_id).values_list(
+        'user_id', flat=True
+    )
+    batch = []
+    for user_id in follower_ids.iterator():
+        batch.append(user_id)
+        if len(batch) == FEED_BATCH_SIZE:
+            push_recipe(recipe.pk, batch)
+            batch = []
+    if batch:
+        push_recipe(recipe.pk, batch)
+
+
+def push_recipe(recipe_id, user_ids):
+    FeedItem.objects.bulk_create(
+        [FeedItem(user_id=user_id, recipe_id=recipe_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    trim_feeds(user_ids)
+
+
+def backfill_feed(user_id, author):
+    if is_pulled_author(author):
+        return
+    recipe_ids = Recipe.objects.filter(author=author).values_list('id', flat=True)
+    FeedItem.objects.bulk_create(
+        [
+            FeedItem(user_id=user_id, recipe_id=recipe_id)
+            for recipe_id in recipe_ids[: settings.FEED_MAX_LENGTH]
+        ],
+        batch_size=FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    trim_feeds([user_id])
+
+
+def remove_from_feed(user_id, author_id):
+    FeedItem.objects.filter(
+        user=user_id,
+        recipe__in=Recipe.objects.filter(author=author_id).values('id'),
+    ).delete()
+
+
+def get_pulled_author_ids(user):
+    return list(
+        Follow.objects.filter(
+            user=user,
+            author__followers_count__gt=settings.FEED_FANOUT_MAX_FOLLOWERS,
+        ).values_list('author_id', flat=True)
+    )
+
+
+class FeedRecipes:
+    def __init__(self, user, recipes, ordering='-id', position=None):
+        self.user = user
+        self.recipes = recipes
+        self.ordering = ordering
+        self.position = position
+
+    def order_by(self, ordering):
+        return FeedRecipes(self.user, self.recipes, ordering, self.position)
+
+    def filter(self, **position):
+        ((lookup, value),) = position.items()
+        return FeedRecipes(
+            self.user, self.recipes, self.ordering, (lookup.split('__')[1], value)
+        )
+
+    def get_recipe_ids(self, limit):
+        descending = self.ordering.startswith('-')
+        prefix = '-' if descending else ''
+        feed_items = FeedItem.objects.filter(user=self.user)
+        pulled_author_ids = get_pulled_author_ids(self.user)
+        pulled_recipes = Recipe.objects.filter(author__in=pulled_author_ids)
+        if self.position is not None:
+            lookup, value = self.position
+            feed_items = feed_items.filter(**{f'recipe_id__{lookup}': value})
+            pulled_recipes = pulled_recipes.filter(**{f'id__{lookup}': value})
+        recipe_ids = set(
+            feed_items.order_by(f'{prefix}recipe_id').values_list(
+                'recipe_id', flat=True
+            )[:limit]
+        )
+        if pulled_author_ids:
+            recipe_ids.update(
+                pulled_recipes.order_by(f'{prefix}id').values_list('id', flat=True)[
+                    :limit
+                ]
+            )
+        return sorted(recipe_ids, reverse=descending)
+
+    def __getitem__(self, index):
+        recipe_ids = self.get_recipe_ids(index.stop)[index]
+        recipes = self.recipes.in_bulk(recipe_ids)
+        return [recipes[pk] for pk in recipe_ids if pk in recipes]
+
+
+def rebuild_feeds(user_ids=None):
+    follows = Follow.objects.select_related('author')
+    if user_ids is not None:
+        follows = follows.filter(user__in=user_ids)
+        FeedItem.objects.filter(user__in=user_ids).delete()
+    else:
+        FeedItem.objects.all().delete()
+    for follow in follows.iterator():
+        backfill_feed(follow.user_id, follow.author)
@@ -0,0 +1,66 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image
+
+from .models import Recipe
+
+IMAGE_VARIANT_FORMATS = (
+    ('webp', 'WEBP'),
+    ('jpeg', 'JPEG'),
+)
+
+
+def get_image_name(digest, extension):
+    upload_to = Recipe._meta.get_field('image').upload_to
+    return os.path.join(upload_to, f'{digest}.{extension}')
+
+
+def get_image_variant_name(image_name, variant, extension):
+    directory, filename = os.path.split(os.path.splitext(image_name)[0])
+    return os.path.join(directory, 'variants', f'{filename}_{variant}.{extension}')
+
+
+def get_image_variant_key(variant, extension):
+    return f'{variant}.{extension}'
+
+
+def create_image_variants(image_name):
+    with default_storage.open(image_name) as image_file:
+        image = Image.open(image_file)
+        image.load()
+    image = image.convert('RGB')
+    variant_keys = []
+    for variant, size in settings.RECIPE_IMAGE_VARIANTS.items():
+        resized_image = image.copy()
+        resized_image.thumbnail(size)
+        for extension, image_format in IMAGE_VARIANT_FORMATS:
+            variant_keys.append(get_image_variant_key(variant, extension))
+            variant_name = get_image_variant_name(image_name, variant, extension)
+            if default_storage.exists(variant_name):
+                continue
+            buffer = BytesIO()
+            resized_image.save(buffer, image_format, quality=85)
+            default_storage.save(variant_name, ContentFile(buffer.getvalue()))
+    Recipe.objects.filter(image=image_name).update(
+        ready_image_variants=' '.join(variant_keys), modified=timezone.now()
+    )
+
+
+def get_image_variant_names(image_name, ready_image_variants):
+    ready_keys = set(ready_image_variants.split())
+    variant_names = {}
+    for variant in settings.RECIPE_IMAGE_VARIANTS:
+        variant_names[variant] = {}
+        for extension, _ in IMAGE_VARIANT_FORMATS:
+            if get_image_variant_key(variant, extension) in ready_keys:
+                variant_names[variant][extension] = get_image_variant_name(
+                    image_name, variant, extension
+                )
+            else:
+                variant_names[variant][extension] = image_name
+    return variant_names
@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipes.cache import reference_data
+from recipes.models import Ingredient, MeasurementUnit
+from recipes.utils import batches
+
+JSON_CHUNK_SIZE = 64 * 1024
+UNIT_CONVERSIONS = (
+    ('кг', 'г', 1000),
+    ('л', 'мл', 1000),
+)
+
+
+def read_csv(source):
+    for row in csv.reader(source):
+        if row:
+            yield {'name': row[0].strip(), 'measurement_unit': row[1].strip()}
+
+
+def read_json(source):
+    decoder = json.JSONDecoder()
+    buffer = source.read(JSON_CHUNK_SIZE).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('JSON-файл должен содержать массив ингредиентов')
+    position = 1
+    while True:
+        while position < len(buffer) and buffer[position] in ', \t\r\n':
+            position += 1
+        if buffer.startswith(']', position):
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = source.read(JSON_CHUNK_SIZE)
+            if not chunk:
+                raise CommandError('JSON-файл оборван или повреждён')
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
+
+
+def fill_unit_conversions():
+    for name, base_unit, factor in UNIT_CONVERSIONS:
+        if MeasurementUnit.objects.filter(name=base_unit).exists():
+            MeasurementUnit.objects.filter(name=name, base_unit__isnull=True).update(
+                base_unit=base_unit, factor=factor
+            )
+
+
+READERS = {
+    'csv': read_csv,
+    'json': read_json,
+}
+
+
+class Command(BaseCommand):
+    help = 'Загружает ингредиенты и единицы измерения из CSV или JSON пакетами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=READERS)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.')
+        if file_format not in READERS:
+            raise CommandError(f'Неизвестный формат файла: {file_format}')
+        started = time.perf_counter()
+        units_before = MeasurementUnit.objects.count()
+        ingredients_before = Ingredient.objects.count()
+        seen_units = set(MeasurementUnit.objects.values_list('name', flat=True))
+        processed = 0
+
+        with open(path, encoding='utf-8') as source, transaction.atomic():
+            for batch in batches(READERS[file_format](source), options['batch_size']):
+                new_units = {item['measurement_unit'] for item in batch} - seen_units
+                MeasurementUnit.objects.bulk_create(
+                    [MeasurementUnit(name=name) for name in new_units],
+                    ignore_conflicts=True,
+                )
+                seen_units |= new_units
+                Ingredient.objects.bulk_create(
+                    [
+                        Ingredient(
+                            name=item['name'],
+                            measurement_unit_id=item['measurement_unit'],
+                        )
+                        for item in batch
+                    ],
+                    ignore_conflicts=True,
+                )
+                processed += len(batch)
+            fill_unit_conversions()
+        reference_data.invalidate()
+
+        units_inserted = MeasurementUnit.objects.count() - units_before
+        ingredients_inserted = Ingredient.objects.count() - ingredients_before
+        self.stdout.write(
+            f'Обработано строк: {processed}, '
+            f'добавлено ингредиентов: {ingredients_inserted}, '
+            f'уже были в базе: {processed - ingredients_inserted}, '
+            f'добавлено единиц измерения: {units_inserted}, '
+            f'время: {time.perf_counter() - started:.2f} с'
+        )
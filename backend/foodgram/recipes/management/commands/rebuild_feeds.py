@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.feed import rebuild_feeds
+from recipes.models import FeedItem
+
+
+class Command(BaseCommand):
+    help = 'Заново заполняет ленты подписок из рецептов авторов, на которых подписаны'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_feeds(options['user_ids'])
+        self.stdout.write(f'Записей в лентах: {FeedItem.objects.count()}')
@@ -0,0 +1,165 @@
+import os
+import random
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.cache import reference_data
+from recipes.models import (
+    FavouriteRecipe,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    Tag,
+)
+from recipes.search import update_search_documents
+from recipes.utils import batches
+from shopping_cart.models import ShoppingOrder
+from users.models import Follow, User
+
+SEED_PASSWORD = 'seed-password'
+SEED_IMAGE = 'recipes/seed.png'
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу тестовыми пользователями, рецептами, подписками и корзинами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--recipes', type=int, default=1000)
+        parser.add_argument('--tags', type=int, default=10)
+        parser.add_argument('--ingredients-per-recipe', type=int, default=8)
+        parser.add_argument('--favourites-per-user', type=int, default=20)
+        parser.add_argument('--follows-per-user', type=int, default=10)
+        parser.add_argument('--cart-per-user', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def bulk_create(self, model, rows):
+        total = 0
+        for batch in batches(rows, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, ignore_conflicts=True)
+            total += len(batch)
+        self.stdout.write(f'{model._meta.label}: {total}')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        rng = random.Random(options['seed'])
+
+        if not Ingredient.objects.exists():
+            call_command('loaddata', os.path.join(settings.BASE_DIR, 'fixtures.json'))
+        ingredient_ids = list(Ingredient.objects.values_list('id', flat=True))
+
+        start = (
+            User.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        ) + 1
+        password = make_password(SEED_PASSWORD)
+        self.bulk_create(
+            User,
+            (
+                User(
+                    email=f'seed{index}@example.com',
+                    username=f'seed{index}',
+                    first_name='Seed',
+                    last_name=str(index),
+                    password=password,
+                )
+                for index in range(start, start + options['users'])
+            ),
+        )
+        user_ids = list(
+            User.objects.filter(username__startswith='seed').values_list(
+                'id', flat=True
+            )
+        )
+
+        self.bulk_create(
+            Tag,
+            (
+                Tag(name=f'seed-{index}', slug=f'seed-{index}', color='#49B64E')
+                for index in range(options['tags'])
+            ),
+        )
+        tag_ids = list(Tag.objects.values_list('id', flat=True))
+        reference_data.invalidate()
+
+        last_recipe_id = (
+            Recipe.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        )
+        self.bulk_create(
+            Recipe,
+            (
+                Recipe(
+                    name=f'Рецепт {index}',
+                    text=f'Описание рецепта {index}',
+                    cooking_time=rng.randint(5, 180),
+                    image=SEED_IMAGE,
+                    author_id=rng.choice(user_ids),
+                )
+                for index in range(options['recipes'])
+            ),
+        )
+        recipe_ids = list(
+            Recipe.objects.filter(id__gt=last_recipe_id).values_list('id', flat=True)
+        )
+        self.bulk_create(
+            RecipeTag,
+            (
+                RecipeTag(recipe_id=recipe_id, tag_id=tag_id)
+                for recipe_id in recipe_ids
+                for tag_id in rng.sample(tag_ids, min(len(tag_ids), rng.randint(1, 3)))
+            ),
+        )
+        self.bulk_create(
+            RecipeIngredient,
+            (
+                RecipeIngredient(
+                    recipe_id=recipe_id,
+                    ingredient_id=ingredient_id,
+                    amount=rng.randint(1, 500),
+                )
+                for recipe_id in recipe_ids
+                for ingredient_id in rng.sample(
+                    ingredient_ids,
+                    min(len(ingredient_ids), options['ingredients_per_recipe']),
+                )
+            ),
+        )
+        for batch in batches(recipe_ids, self.batch_size):
+            with transaction.atomic():
+                update_search_documents(batch)
+
+        all_recipe_ids = list(Recipe.objects.values_list('id', flat=True))
+        for model, per_user in (
+            (FavouriteRecipe, options['favourites_per_user']),
+            (ShoppingOrder, options['cart_per_user']),
+        ):
+            self.bulk_create(
+                model,
+                (
+                    model(user_id=user_id, recipe_id=recipe_id)
+                    for user_id in user_ids
+                    for recipe_id in rng.sample(
+                        all_recipe_ids, min(len(all_recipe_ids), per_user)
+                    )
+                ),
+            )
+        self.bulk_create(
+            Follow,
+            (
+                Follow(user_id=user_id, author_id=author_id)
+                for user_id in user_ids
+                for author_id in rng.sample(
+                    user_ids, min(len(user_ids), options['follows_per_user'])
+                )
+                if author_id != user_id
+            ),
+        )
+        call_command('recount_counters', stdout=self.stdout)
+        call_command('rebuild_shopping_lists', stdout=self.stdout)
+        call_command('rebuild_feeds', stdout=self.stdout)
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-18 10:12
+
+from django.db import migrations
+
+
+def create_ingredient_name_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS recipes_ingredient_name_trgm '
+        'ON recipes_ingredient USING gin (UPPER(name::text) gin_trgm_ops)'
+    )
+
+
+def drop_ingredient_name_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS recipes_ingredient_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_auto_20221221_0734'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_ingredient_name_trgm_index,
+            drop_ingredient_name_trgm_index,
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+COUNTERS = (
+    (
+        ('recipes', 'Recipe'),
+        'favourites_count',
+        ('recipes', 'FavouriteRecipe'),
+        'recipe',
+    ),
+    (('users', 'User'), 'recipes_count', ('recipes', 'Recipe'), 'author'),
+    (('users', 'User'), 'followers_count', ('users', 'Follow'), 'author'),
+    (('users', 'User'), 'cart_size', ('shopping_cart', 'ShoppingOrder'), 'user'),
+)
+
+
+def fill_counters(apps, schema_editor):
+    for model_name, field, related_model_name, related_field in COUNTERS:
+        related_model = apps.get_model(*related_model_name)
+        apps.get_model(*model_name).objects.update(
+            **{
+                field: Coalesce(
+                    Subquery(
+                        related_model.objects.filter(**{related_field: OuterRef('pk')})
+                        .order_by()
+                        .values(related_field)
+                        .annotate(count=Count('pk'))
+                        .values('count')
+                    ),
+                    0,
+                )
+            }
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0013_recipe_favourites_count'),
+        ('shopping_cart', '0005_auto_20221221_0734'),
+        ('users', '0006_auto_20261018_1711'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
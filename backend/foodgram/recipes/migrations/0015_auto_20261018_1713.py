@@ -0,0 +1,108 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_links(apps, schema_editor):
+    for model_name, field in (('RecipeTag', 'tag'), ('RecipeIngredient', 'ingredient')):
+        model = apps.get_model('recipes', model_name)
+        keep_ids = (
+            model.objects.order_by()
+            .values('recipe', field)
+            .annotate(keep_id=Min('id'))
+            .values_list('keep_id', flat=True)
+        )
+        model.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0014_fill_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_links, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='favouriterecipe',
+            name='recipe',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='favourites',
+                to='recipes.Recipe',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='favouriterecipe',
+            name='user',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='favourites',
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name='recipeingredient',
+            name='recipe',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to='recipes.Recipe',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='recipetag',
+            name='recipe',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='recipe_tags',
+                to='recipes.Recipe',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='recipetag',
+            name='tag',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='recipe_tags',
+                to='recipes.Tag',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='favouriterecipe',
+            index=models.Index(
+                fields=['recipe', 'user'], name='favourite_recipe_user_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recipeingredient',
+            index=models.Index(
+                fields=['recipe', 'ingredient', 'amount'], name='recipe_ingr_amount_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recipetag',
+            index=models.Index(
+                fields=['tag', 'recipe'], name='recipe_tag_tag_recipe_idx'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='recipeingredient',
+            constraint=models.UniqueConstraint(
+                fields=('recipe', 'ingredient'), name='recipe_ingredient_unique'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='recipetag',
+            constraint=models.UniqueConstraint(
+                fields=('recipe', 'tag'), name='recipe_tag_unique'
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0015_auto_20261018_1713'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurementunit',
+            name='base_unit',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='derived_units',
+                to='recipes.MeasurementUnit',
+                to_field='name',
+            ),
+        ),
+        migrations.AddField(
+            model_name='measurementunit',
+            name='factor',
+            field=models.FloatField(default=1),
+        ),
+    ]
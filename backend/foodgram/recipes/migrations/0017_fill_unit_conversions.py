@@ -0,0 +1,32 @@
+from django.db import migrations
+
+UNIT_CONVERSIONS = (
+    ('кг', 'г', 1000),
+    ('л', 'мл', 1000),
+)
+
+
+def fill_unit_conversions(apps, schema_editor):
+    MeasurementUnit = apps.get_model('recipes', 'MeasurementUnit')
+    for name, base_unit, factor in UNIT_CONVERSIONS:
+        if MeasurementUnit.objects.filter(name=base_unit).exists():
+            MeasurementUnit.objects.filter(name=name).update(
+                base_unit=base_unit, factor=factor
+            )
+
+
+def clear_unit_conversions(apps, schema_editor):
+    apps.get_model('recipes', 'MeasurementUnit').objects.update(
+        base_unit=None, factor=1
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0016_auto_20261018_1723'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_unit_conversions, clear_unit_conversions),
+    ]
@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+SEARCH_CONFIG = 'russian'
+BATCH_SIZE = 500
+
+
+def fill_search_documents(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    RecipeTag = apps.get_model('recipes', 'RecipeTag')
+    RecipeIngredient = apps.get_model('recipes', 'RecipeIngredient')
+    recipe_ids = list(Recipe.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(recipe_ids), BATCH_SIZE):
+        batch = recipe_ids[start : start + BATCH_SIZE]
+        parts = defaultdict(list)
+        for recipe_id, name in RecipeTag.objects.filter(recipe__in=batch).values_list(
+            'recipe_id', 'tag__name'
+        ):
+            parts[recipe_id].append(name)
+        for recipe_id, name in RecipeIngredient.objects.filter(
+            recipe__in=batch
+        ).values_list('recipe_id', 'ingredient__name'):
+            parts[recipe_id].append(name)
+        recipes = list(Recipe.objects.filter(pk__in=batch).only('id', 'text'))
+        for recipe in recipes:
+            recipe.search_document = ' '.join(parts[recipe.id] + [recipe.text])
+        Recipe.objects.bulk_update(recipes, ['search_document'])
+
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Recipe.objects.update(
+        search_vector=SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('search_document', weight='B', config=SEARCH_CONFIG)
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS recipes_recipe_search_vector_gin '
+        'ON recipes_recipe USING gin (search_vector)'
+    )
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS recipes_recipe_search_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0018_auto_20261018_1726'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_documents, drop_search_vector_index),
+    ]
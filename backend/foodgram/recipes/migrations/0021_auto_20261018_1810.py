@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0020_auto_20261018_1729'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='ready_image_variants',
+            field=models.CharField(
+                blank=True, default='', editable=False, max_length=255
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import migrations
+
+IMAGE_VARIANT_EXTENSIONS = ('webp', 'jpeg')
+
+
+def fill_ready_image_variants(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    image_names = Recipe.objects.values_list('image', flat=True).distinct()
+    for image_name in image_names.iterator():
+        directory, filename = os.path.split(os.path.splitext(image_name)[0])
+        variant_keys = [
+            f'{variant}.{extension}'
+            for variant in settings.RECIPE_IMAGE_VARIANTS
+            for extension in IMAGE_VARIANT_EXTENSIONS
+            if default_storage.exists(
+                os.path.join(directory, 'variants', f'{filename}_{variant}.{extension}')
+            )
+        ]
+        if variant_keys:
+            Recipe.objects.filter(image=image_name).update(
+                ready_image_variants=' '.join(variant_keys)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0021_auto_20261018_1810'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_ready_image_variants, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from users.models import User
@@ -25,6 +26,15 @@ class Tag(models.Model):
 
 class MeasurementUnit(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    base_unit = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        to_field='name',
+        on_delete=models.SET_NULL,
+        related_name='derived_units',
+    )
+    factor = models.FloatField(default=1)
 
     class Meta:
         ordering = ('-name',)
@@ -75,6 +85,13 @@ class Recipe(models.Model):
     ingredients = models.ManyToManyField(
         Ingredient, through='RecipeIngredient', related_name='recipes'
     )
+    modified = models.DateTimeField(auto_now=True)
+    ready_image_variants = models.CharField(
+        max_length=255, blank=True, default='', editable=False
+    )
+    favourites_count = models.PositiveIntegerField(default=0)
+    search_document = models.TextField(blank=True, default='', editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ('-id',)
@@ -87,19 +104,46 @@ class Recipe(models.Model):
 
 class RecipeTag(models.Model):
     recipe = models.ForeignKey(
-        Recipe, on_delete=models.CASCADE, related_name='recipe_tags'
+        Recipe, on_delete=models.CASCADE, related_name='recipe_tags', db_index=False
+    )
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name='recipe_tags', db_index=False
     )
-    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='recipe_tags')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'tag'],
+                name='recipe_tag_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'recipe'], name='recipe_tag_tag_recipe_idx'),
+        ]
 
     def __str__(self):
         return f'pk: {self.id} тег {self.tag} в рецепте {self.recipe}'
 
 
 class RecipeIngredient(models.Model):
-    recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE)
+    recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE, db_index=False)
     ingredient = models.ForeignKey(Ingredient, on_delete=models.CASCADE)
     amount = models.PositiveIntegerField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'ingredient'],
+                name='recipe_ingredient_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['recipe', 'ingredient', 'amount'],
+                name='recipe_ingr_amount_idx',
+            ),
+        ]
+
     def __str__(self):
         return f'pk: {self.id} ингредиент {self.ingredient} в рецепте {self.recipe}'
 
@@ -109,11 +153,13 @@ class FavouriteRecipe(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='favourites',
+        db_index=False,
     )
     recipe = models.ForeignKey(
         Recipe,
         on_delete=models.CASCADE,
         related_name='favourites',
+        db_index=False,
     )
 
     class Meta:
@@ -124,8 +170,33 @@ class FavouriteRecipe(models.Model):
                 name='favourite_user_recipe_unique',
             ),
         ]
+        indexes = [
+            models.Index(fields=['recipe', 'user'], name='favourite_recipe_user_idx'),
+        ]
         verbose_name = 'Рецепт в избранном'
         verbose_name_plural = 'Рецепты в избранном'
 
     def __str__(self):
         return f'pk: {self.id} пользователь {self.user} добавил рецепт {self.recipe} в избранное'
+
+
+class FeedItem(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='feed_items', db_index=False
+    )
+    recipe = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name='feed_items'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recipe'],
+                name='feed_item_user_recipe_unique',
+            ),
+        ]
+        verbose_name = 'Рецепт в ленте'
+        verbose_name_plural = 'Рецепты в лентах'
+
+    def __str__(self):
+        return f'pk: {self.id} рецепт {self.recipe} в ленте {self.user}'
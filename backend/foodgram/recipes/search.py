@@ -0,0 +1,214 @@
+import bisect
+import math
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .cache import VersionedCache
+from .models import Recipe, RecipeIngredient, RecipeTag
+from .utils import batches
+
+SEARCH_CONFIG = 'russian'
+SEARCH_INDEX_VERSION_KEY = 'recipes:search-index-version'
+SEARCH_REINDEX_MARGIN = 60
+SEARCH_FILTER_BATCH_SIZE = 500
+NAME_WEIGHT = 3
+PREFIX_MATCH_WEIGHT = 0.5
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def get_search_documents(recipe_ids):
+    parts = defaultdict(list)
+    for recipe_id, name in RecipeTag.objects.filter(recipe__in=recipe_ids).values_list(
+        'recipe_id', 'tag__name'
+    ):
+        parts[recipe_id].append(name)
+    for recipe_id, name in RecipeIngredient.objects.filter(
+        recipe__in=recipe_ids
+    ).values_list('recipe_id', 'ingredient__name'):
+        parts[recipe_id].append(name)
+    for recipe_id, text in Recipe.objects.filter(pk__in=recipe_ids).values_list(
+        'id', 'text'
+    ):
+        parts[recipe_id].append(text)
+    return {recipe_id: ' '.join(document) for recipe_id, document in parts.items()}
+
+
+def get_search_vector():
+    return SearchVector('name', weight='A', config=SEARCH_CONFIG) + SearchVector(
+        'search_document', weight='B', config=SEARCH_CONFIG
+    )
+
+
+def update_search_documents(recipe_ids):
+    documents = get_search_documents(recipe_ids)
+    current_documents = dict(
+        Recipe.objects.filter(pk__in=recipe_ids).values_list('id', 'search_document')
+    )
+    modified = timezone.now()
+    Recipe.objects.bulk_update(
+        [
+            Recipe(pk=recipe_id, search_document=document, modified=modified)
+            for recipe_id, document in documents.items()
+            if current_documents.get(recipe_id) != document
+        ],
+        ['search_document', 'modified'],
+        batch_size=500,
+    )
+    if connection.vendor == 'postgresql':
+        Recipe.objects.filter(pk__in=recipe_ids).update(
+            search_vector=get_search_vector()
+        )
+    transaction.on_commit(recipe_search_index.invalidate)
+
+
+class RecipeSearchIndex(VersionedCache):
+    version_key = SEARCH_INDEX_VERSION_KEY
+
+    def load(self):
+        return self.refresh(
+            {'postings': {}, 'terms': {}, 'loaded_at': None}, Recipe.objects.all()
+        )
+
+    def reload(self, data):
+        changed_since = data['loaded_at'] - timedelta(seconds=SEARCH_REINDEX_MARGIN)
+        return self.refresh(data, Recipe.objects.filter(modified__gte=changed_since))
+
+    def refresh(self, data, changed_recipes):
+        loaded_at = timezone.now()
+        recipe_ids = set(Recipe.objects.values_list('id', flat=True))
+        postings = dict(data['postings'])
+        terms = dict(data['terms'])
+        copied_tokens = set()
+
+        def get_postings(token):
+            if token not in copied_tokens:
+                postings[token] = dict(postings.get(token, {}))
+                copied_tokens.add(token)
+            return postings[token]
+
+        def remove_recipe(recipe_id):
+            for token in terms.pop(recipe_id, ()):
+                token_postings = get_postings(token)
+                token_postings.pop(recipe_id, None)
+                if not token_postings:
+                    del postings[token]
+                    copied_tokens.discard(token)
+
+        for recipe_id in set(terms) - recipe_ids:
+            remove_recipe(recipe_id)
+        documents = changed_recipes.values_list('id', 'name', 'search_document')
+        for recipe_id, name, document in documents.iterator():
+            remove_recipe(recipe_id)
+            frequencies = defaultdict(int)
+            for weight, text in ((NAME_WEIGHT, name), (1, document)):
+                for token in tokenize(text):
+                    frequencies[token] += weight
+            for token, frequency in frequencies.items():
+                get_postings(token)[recipe_id] = frequency
+            terms[recipe_id] = tuple(frequencies)
+        return {
+            'postings': postings,
+            'terms': terms,
+            'tokens': sorted(postings),
+            'size': len(recipe_ids),
+            'loaded_at': loaded_at,
+        }
+
+    def search(self, query):
+        data = self.get_data()
+        postings, tokens = data['postings'], data['tokens']
+        scores = None
+        for value in set(tokenize(query)):
+            matches = {}
+            position = bisect.bisect_left(tokens, value)
+            while position < len(tokens) and tokens[position].startswith(value):
+                token_postings = postings[tokens[position]]
+                weight = math.log(1 + data['size'] / len(token_postings))
+                if tokens[position] != value:
+                    weight *= PREFIX_MATCH_WEIGHT
+                for recipe_id, frequency in token_postings.items():
+                    matches[recipe_id] = matches.get(recipe_id, 0) + frequency * weight
+                position += 1
+            if scores is not None:
+                matches = {
+                    recipe_id: score + scores[recipe_id]
+                    for recipe_id, score in matches.items()
+                    if recipe_id in scores
+                }
+            scores = matches
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        return sorted(scores, key=lambda recipe_id: (-scores[recipe_id], -recipe_id))
+
+
+recipe_search_index = RecipeSearchIndex()
+
+
+def search_recipes(queryset, query):
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-search_rank', '-id')
+        )
+    return RankedRecipes(queryset, recipe_search_index.search(query))
+
+
+class RankedRecipes:
+    ordered = True
+
+    def __init__(self, queryset, ranked_ids):
+        self.queryset = queryset
+        self.ranked_ids = ranked_ids
+        self._recipe_ids = None
+
+    @property
+    def recipe_ids(self):
+        if self._recipe_ids is None:
+            matched_ids = set()
+            for batch in batches(self.ranked_ids, SEARCH_FILTER_BATCH_SIZE):
+                matched_ids.update(
+                    self.queryset.filter(pk__in=batch).values_list('pk', flat=True)
+                )
+            self._recipe_ids = [
+                recipe_id for recipe_id in self.ranked_ids if recipe_id in matched_ids
+            ]
+        return self._recipe_ids
+
+    def count(self):
+        return len(self.recipe_ids)
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        for start in range(0, self.count(), SEARCH_FILTER_BATCH_SIZE):
+            yield from self[start : start + SEARCH_FILTER_BATCH_SIZE]
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return list(self[index : index + 1])[0]
+        recipe_ids = self.recipe_ids[index]
+        return self.queryset.filter(pk__in=recipe_ids).order_by(
+            Case(
+                *[
+                    When(pk=recipe_id, then=Value(position))
+                    for position, recipe_id in enumerate(recipe_ids)
+                ],
+                default=Value(len(recipe_ids)),
+                output_field=IntegerField(),
+            )
+        )
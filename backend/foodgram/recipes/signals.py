@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from .cache import reference_data
+from .models import Ingredient, MeasurementUnit, Recipe, Tag
+from .search import update_search_documents
+from .utils import batches
+
+SEARCH_UPDATE_BATCH_SIZE = 500
+SEARCH_RELATIONS = {Tag: 'tags', Ingredient: 'ingredients'}
+
+
+def invalidate_reference_data(sender, **kwargs):
+    transaction.on_commit(reference_data.invalidate)
+
+
+def get_related_recipe_ids(sender, instance):
+    return list(
+        Recipe.objects.filter(**{SEARCH_RELATIONS[sender]: instance}).values_list(
+            'id', flat=True
+        )
+    )
+
+
+def update_recipe_search_documents(recipe_ids):
+    for batch in batches(recipe_ids, SEARCH_UPDATE_BATCH_SIZE):
+        update_search_documents(batch)
+
+
+def remember_search_name(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._search_old_name = (
+        sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    )
+
+
+def update_related_search_documents(sender, instance, created, raw, **kwargs):
+    if created or raw:
+        return
+    if getattr(instance, '_search_old_name', instance.name) == instance.name:
+        return
+    update_recipe_search_documents(get_related_recipe_ids(sender, instance))
+
+
+def remember_related_recipes(sender, instance, **kwargs):
+    instance._search_recipe_ids = get_related_recipe_ids(sender, instance)
+
+
+def update_unlinked_search_documents(sender, instance, **kwargs):
+    update_recipe_search_documents(getattr(instance, '_search_recipe_ids', []))
+
+
+for model in (Tag, Ingredient, MeasurementUnit):
+    post_save.connect(invalidate_reference_data, sender=model)
+    post_delete.connect(invalidate_reference_data, sender=model)
+
+for model in SEARCH_RELATIONS:
+    pre_save.connect(remember_search_name, sender=model)
+    post_save.connect(update_related_search_documents, sender=model)
+    pre_delete.connect(remember_related_recipes, sender=model)
+    post_delete.connect(update_unlinked_search_documents, sender=model)
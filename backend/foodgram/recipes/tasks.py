@@ -0,0 +1,39 @@
+from tasks.queue import enqueue, task
+
+from . import feed, images
+from .models import Recipe
+
+
+@task()
+def create_image_variants(image_name):
+    images.create_image_variants(image_name)
+
+
+@task()
+def fan_out_recipe(recipe_id):
+    recipe = Recipe.objects.select_related('author').filter(pk=recipe_id).first()
+    if recipe is not None:
+        feed.fan_out_recipe(recipe)
+
+
+def schedule_image_variants(image_name):
+    ready_image_variants = (
+        Recipe.objects.filter(image=image_name)
+        .exclude(ready_image_variants='')
+        .values_list('ready_image_variants', flat=True)
+        .first()
+    )
+    if ready_image_variants is not None:
+        Recipe.objects.filter(image=image_name, ready_image_variants='').update(
+            ready_image_variants=ready_image_variants
+        )
+        return
+    enqueue(
+        create_image_variants,
+        image_name,
+        idempotency_key=f'image-variants:{image_name}',
+    )
+
+
+def schedule_fan_out(recipe):
+    enqueue(fan_out_recipe, recipe.pk, idempotency_key=f'fan-out:{recipe.pk}')
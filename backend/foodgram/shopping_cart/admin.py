@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import ShoppingOrder
+from .models import ShoppingListItem, ShoppingOrder
 
 
 @admin.register(ShoppingOrder)
@@ -10,3 +10,14 @@ class ShoppingOrderAdmin(admin.ModelAdmin):
         'user',
         'recipe',
     )
+
+
+@admin.register(ShoppingListItem)
+class ShoppingListItemAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'user',
+        'ingredient',
+        'amount',
+    )
+    list_select_related = ('user', 'ingredient')
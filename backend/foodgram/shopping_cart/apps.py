@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ShoppingCartConfig(AppConfig):
     name = 'shopping_cart'
     verbose_name = 'Покупки'
+
+    def ready(self):
+        from . import signals  # noqa: F401
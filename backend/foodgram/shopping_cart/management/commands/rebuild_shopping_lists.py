@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from shopping_cart.models import ShoppingListItem
+from shopping_cart.shopping_list import rebuild_shopping_lists
+
+
+class Command(BaseCommand):
+    help = 'Заново собирает списки покупок из рецептов в корзинах пользователей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_shopping_lists(options['user_ids'])
+        self.stdout.write(
+            f'Позиций в списках покупок: {ShoppingListItem.objects.count()}'
+        )
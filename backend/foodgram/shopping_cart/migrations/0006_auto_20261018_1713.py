@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shopping_cart', '0005_auto_20221221_0734'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='shoppingorder',
+            name='recipe',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='shopping_orders',
+                to='recipes.Recipe',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='shoppingorder',
+            name='user',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='shopping_orders',
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='shoppingorder',
+            index=models.Index(
+                fields=['recipe', 'user'], name='shopping_order_recipe_user_idx'
+            ),
+        ),
+    ]
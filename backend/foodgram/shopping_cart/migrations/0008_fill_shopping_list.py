@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.models import Sum
+
+
+def fill_shopping_list(apps, schema_editor):
+    ShoppingOrder = apps.get_model('shopping_cart', 'ShoppingOrder')
+    ShoppingListItem = apps.get_model('shopping_cart', 'ShoppingListItem')
+    totals = (
+        ShoppingOrder.objects.values(
+            'user_id', 'recipe__recipeingredient__ingredient_id'
+        )
+        .annotate(amount=Sum('recipe__recipeingredient__amount'))
+        .filter(amount__gt=0)
+        .order_by()
+    )
+    ShoppingListItem.objects.bulk_create(
+        (
+            ShoppingListItem(
+                user_id=total['user_id'],
+                ingredient_id=total['recipe__recipeingredient__ingredient_id'],
+                amount=total['amount'],
+            )
+            for total in totals.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+def clear_shopping_list(apps, schema_editor):
+    apps.get_model('shopping_cart', 'ShoppingListItem').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shopping_cart', '0007_auto_20261018_1720'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_shopping_list, clear_shopping_list),
+    ]
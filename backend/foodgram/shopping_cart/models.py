@@ -1,15 +1,15 @@
 from django.db import models
 
-from recipes.models import Recipe
+from recipes.models import Ingredient, Recipe
 from users.models import User
 
 
 class ShoppingOrder(models.Model):
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name='shopping_orders'
+        User, on_delete=models.CASCADE, related_name='shopping_orders', db_index=False
     )
     recipe = models.ForeignKey(
-        Recipe, on_delete=models.CASCADE, related_name='shopping_orders'
+        Recipe, on_delete=models.CASCADE, related_name='shopping_orders', db_index=False
     )
 
     class Meta:
@@ -20,8 +20,39 @@ class ShoppingOrder(models.Model):
                 name='shopping_order_user_recipe_unique',
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['recipe', 'user'], name='shopping_order_recipe_user_idx'
+            ),
+        ]
         verbose_name = 'Список покупок'
         verbose_name_plural = 'Списки покупок'
 
     def __str__(self):
         return f'pk: {self.id} пользователь {self.user} добавил в корзину рецепт {self.recipe}'
+
+
+class ShoppingListItem(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='shopping_list_items',
+        db_index=False,
+    )
+    ingredient = models.ForeignKey(
+        Ingredient, on_delete=models.CASCADE, related_name='shopping_list_items'
+    )
+    amount = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name='shopping_list_user_ingredient_unique',
+            ),
+        ]
+        verbose_name = 'Ингредиент в списке покупок'
+        verbose_name_plural = 'Ингредиенты в списках покупок'
+
+    def __str__(self):
+        return f'pk: {self.id} {self.ingredient} x {self.amount} для {self.user}'
@@ -0,0 +1,125 @@
+from django.db import transaction
+from django.db.models import Case, CharField, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Round
+
+from recipes.models import MeasurementUnit, RecipeIngredient
+
+from .models import ShoppingListItem, ShoppingOrder
+
+
+def get_recipe_amounts(recipe_id, sign=1):
+    return {
+        ingredient_id: sign * amount
+        for ingredient_id, amount in RecipeIngredient.objects.filter(
+            recipe=recipe_id
+        ).values_list('ingredient_id', 'amount')
+    }
+
+
+def get_recipe_shoppers(recipe_id):
+    return list(
+        ShoppingOrder.objects.filter(recipe=recipe_id).values_list('user_id', flat=True)
+    )
+
+
+def lock_shopping_list_items(user_ids, ingredient_ids):
+    return {
+        (item.user_id, item.ingredient_id): item
+        for item in ShoppingListItem.objects.select_for_update().filter(
+            user__in=user_ids, ingredient__in=ingredient_ids
+        )
+    }
+
+
+@transaction.atomic
+def update_shopping_lists(user_ids, amounts):
+    amounts = {
+        ingredient_id: delta for ingredient_id, delta in amounts.items() if delta
+    }
+    if not user_ids or not amounts:
+        return
+    items = lock_shopping_list_items(user_ids, amounts)
+    missing_items = [
+        ShoppingListItem(user_id=user_id, ingredient_id=ingredient_id, amount=0)
+        for user_id in user_ids
+        for ingredient_id, delta in amounts.items()
+        if delta > 0 and (user_id, ingredient_id) not in items
+    ]
+    if missing_items:
+        ShoppingListItem.objects.bulk_create(
+            missing_items, batch_size=500, ignore_conflicts=True
+        )
+        items = lock_shopping_list_items(user_ids, amounts)
+    changed_items, removed_ids = [], []
+    for item in items.values():
+        item.amount += amounts[item.ingredient_id]
+        if item.amount > 0:
+            changed_items.append(item)
+        else:
+            removed_ids.append(item.pk)
+    ShoppingListItem.objects.filter(pk__in=removed_ids).delete()
+    ShoppingListItem.objects.bulk_update(changed_items, ['amount'], batch_size=500)
+
+
+def rebuild_shopping_lists(user_ids=None):
+    orders = ShoppingOrder.objects.all()
+    items = ShoppingListItem.objects.all()
+    if user_ids is not None:
+        orders = orders.filter(user__in=user_ids)
+        items = items.filter(user__in=user_ids)
+    items.delete()
+    totals = (
+        orders.values('user_id', 'recipe__recipeingredient__ingredient_id')
+        .annotate(amount=Sum('recipe__recipeingredient__amount'))
+        .filter(amount__gt=0)
+        .order_by()
+    )
+    ShoppingListItem.objects.bulk_create(
+        (
+            ShoppingListItem(
+                user_id=total['user_id'],
+                ingredient_id=total['recipe__recipeingredient__ingredient_id'],
+                amount=total['amount'],
+            )
+            for total in totals.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+def sum_in_base_units(items):
+    base_unit = Coalesce(
+        'ingredient__measurement_unit__base_unit', 'ingredient__measurement_unit'
+    )
+    factor = Coalesce('ingredient__measurement_unit__factor', Value(1.0))
+    totals = items.values(name=F('ingredient__name'), base_unit=base_unit).annotate(
+        base_amount=Sum(F('amount') * factor, output_field=FloatField())
+    )
+    conversions = MeasurementUnit.objects.filter(
+        base_unit__isnull=False, factor__gt=1
+    ).order_by('-factor')
+    readable_units = [
+        (Q(base_unit=unit.base_unit_id, base_amount__gte=unit.factor), unit)
+        for unit in conversions
+    ]
+    display_factor = Case(
+        *[
+            When(condition, then=Value(unit.factor))
+            for condition, unit in readable_units
+        ],
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    display_unit = Case(
+        *[When(condition, then=Value(unit.name)) for condition, unit in readable_units],
+        default=F('base_unit'),
+        output_field=CharField(),
+    )
+    return (
+        totals.annotate(
+            total=Round(F('base_amount') * 100 / display_factor) / 100,
+            measurement_unit=display_unit,
+        )
+        .values('name', 'measurement_unit', 'total')
+        .order_by('name')
+    )
@@ -0,0 +1,62 @@
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from recipes.models import RecipeIngredient
+
+from .models import ShoppingOrder
+from .shopping_list import (
+    get_recipe_amounts,
+    get_recipe_shoppers,
+    update_shopping_lists,
+)
+
+
+def add_order_to_shopping_list(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_shopping_lists(
+            [instance.user_id], get_recipe_amounts(instance.recipe_id)
+        )
+
+
+def remove_order_from_shopping_list(sender, instance, **kwargs):
+    update_shopping_lists(
+        [instance.user_id], get_recipe_amounts(instance.recipe_id, -1)
+    )
+
+
+def remember_recipe_ingredient(sender, instance, raw=False, **kwargs):
+    instance._shopping_list_previous = None
+    if not raw and instance.pk is not None:
+        instance._shopping_list_previous = (
+            RecipeIngredient.objects.filter(pk=instance.pk)
+            .values_list('ingredient_id', 'amount')
+            .first()
+        )
+
+
+def save_recipe_ingredient(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    amounts = defaultdict(int)
+    amounts[instance.ingredient_id] += instance.amount
+    previous = getattr(instance, '_shopping_list_previous', None)
+    if previous is not None:
+        ingredient_id, amount = previous
+        amounts[ingredient_id] -= amount
+    if any(amounts.values()):
+        update_shopping_lists(get_recipe_shoppers(instance.recipe_id), amounts)
+
+
+def delete_recipe_ingredient(sender, instance, **kwargs):
+    update_shopping_lists(
+        get_recipe_shoppers(instance.recipe_id),
+        {instance.ingredient_id: -instance.amount},
+    )
+
+
+post_save.connect(add_order_to_shopping_list, sender=ShoppingOrder)
+post_delete.connect(remove_order_from_shopping_list, sender=ShoppingOrder)
+pre_save.connect(remember_recipe_ingredient, sender=RecipeIngredient)
+post_save.connect(save_recipe_ingredient, sender=RecipeIngredient)
+post_delete.connect(delete_recipe_ingredient, sender=RecipeIngredient)
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'finished',
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key')
@@ -0,0 +1,90 @@
+import logging
+import multiprocessing
+import os
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, connections
+
+from tasks.queue import claim_tasks, purge_finished_tasks, run_task
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Запускает процессы, выполняющие фоновые задачи из очереди в базе данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.TASKS['PROCESSES']
+        )
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить все готовые задачи и завершиться',
+        )
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def work(self, batch_size, once):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        done = failed = 0
+        while self.running:
+            try:
+                tasks = claim_tasks(batch_size)
+            except DatabaseError:
+                logger.exception('Не удалось получить задачи из очереди')
+                connections.close_all()
+                time.sleep(settings.TASKS['POLL_INTERVAL'])
+                continue
+            for task in tasks:
+                if run_task(task):
+                    done += 1
+                else:
+                    failed += 1
+            if tasks:
+                continue
+            if once:
+                break
+            purge_finished_tasks()
+            time.sleep(settings.TASKS['POLL_INTERVAL'])
+        self.stdout.write(
+            f'Обработчик {os.getpid()}: выполнено {done}, с ошибкой {failed}'
+        )
+
+    def handle(self, *args, **options):
+        processes = max(options['processes'], 1)
+        if processes > 1 and not connection.features.has_select_for_update_skip_locked:
+            self.stderr.write(
+                'База данных не поддерживает SELECT ... SKIP LOCKED, '
+                'задачи будут выполняться в одном процессе'
+            )
+            processes = 1
+        if processes == 1:
+            self.work(options['batch_size'], options['once'])
+            return
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(
+                target=self.work, args=(options['batch_size'], options['once'])
+            )
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def stop_workers(signum, frame):
+            for worker in workers:
+                worker.terminate()
+
+        signal.signal(signal.SIGTERM, stop_workers)
+        signal.signal(signal.SIGINT, stop_workers)
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,105 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(name=None, max_attempts=None):
+    def register(func):
+        func.task_name = name or f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts or settings.TASKS['MAX_ATTEMPTS']
+        registry[func.task_name] = func
+        return func
+
+    return register
+
+
+def enqueue(func, *args, idempotency_key=None, delay=None, **kwargs):
+    if settings.TASKS['SYNC']:
+        return func(*args, **kwargs)
+    fields = {
+        'name': func.task_name,
+        'payload': json.dumps({'args': args, 'kwargs': kwargs}),
+        'max_attempts': func.max_attempts,
+        'run_after': timezone.now() + timedelta(seconds=delay or 0),
+    }
+    if idempotency_key is None:
+        return Task.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Task.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        Task.objects.filter(idempotency_key=idempotency_key, status=Task.FAILED).update(
+            status=Task.PENDING,
+            attempts=0,
+            locked_at=None,
+            finished=None,
+            last_error='',
+            **fields,
+        )
+        return Task.objects.get(idempotency_key=idempotency_key)
+
+
+def claim_tasks(limit):
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS['LOCK_TIMEOUT'])
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Task.PENDING, run_after__lte=now)
+                | Q(status=Task.RUNNING, locked_at__lt=stale)
+            )
+            .order_by('run_after', 'id')[:limit]
+        )
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+            status=Task.RUNNING, locked_at=now, attempts=F('attempts') + 1
+        )
+    for task in tasks:
+        task.attempts += 1
+    return tasks
+
+
+def run_task(task):
+    func = registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {task.name} не зарегистрирована')
+        payload = json.loads(task.payload)
+        func(*payload['args'], **payload['kwargs'])
+    except Exception:
+        error = traceback.format_exc()
+        logger.error('Задача %s (pk=%s) завершилась ошибкой', task.name, task.pk)
+        if func is not None and task.attempts < task.max_attempts:
+            delay = settings.TASKS['RETRY_DELAY'] * 2 ** (task.attempts - 1)
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.PENDING,
+                run_after=timezone.now() + timedelta(seconds=delay),
+                last_error=error,
+            )
+        else:
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.FAILED, finished=timezone.now(), last_error=error
+            )
+        return False
+    Task.objects.filter(pk=task.pk).update(status=Task.DONE, finished=timezone.now())
+    return True
+
+
+def purge_finished_tasks():
+    return Task.objects.filter(
+        status=Task.DONE,
+        finished__lt=timezone.now()
+        - timedelta(seconds=settings.TASKS['KEEP_FINISHED']),
+    ).delete()[0]
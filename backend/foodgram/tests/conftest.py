@@ -0,0 +1,109 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipes.models import (
+    Ingredient,
+    MeasurementUnit,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    Tag,
+)
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.TASKS = {**settings.TASKS, 'SYNC': True}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def users(db):
+    return [
+        User.objects.create_user(
+            email=f'user{index}@foodgram.ru',
+            username=f'user{index}',
+            first_name='Имя',
+            last_name='Фамилия',
+            password='password',
+        )
+        for index in range(3)
+    ]
+
+
+@pytest.fixture
+def user(users):
+    return users[0]
+
+
+@pytest.fixture
+def tags(db):
+    return [
+        Tag.objects.create(name=f'Тег {index}', slug=f'tag{index}', color='#ffffff')
+        for index in range(3)
+    ]
+
+
+@pytest.fixture
+def ingredients(db):
+    unit = MeasurementUnit.objects.create(name='г')
+    return [
+        Ingredient.objects.create(name=f'Ингредиент {index}', measurement_unit=unit)
+        for index in range(10)
+    ]
+
+
+@pytest.fixture
+def recipes(users, tags, ingredients):
+    recipes = []
+    for index in range(12):
+        recipe = Recipe.objects.create(
+            name=f'Рецепт {index}',
+            text='Описание',
+            cooking_time=10,
+            image='recipes/recipe.png',
+            author=users[index % len(users)],
+        )
+        for tag in tags[: index % len(tags) + 1]:
+            RecipeTag.objects.create(recipe=recipe, tag=tag)
+        for offset in range(index % 4 + 2):
+            RecipeIngredient.objects.create(
+                recipe=recipe,
+                ingredient=ingredients[(index + offset) % len(ingredients)],
+                amount=100,
+            )
+        recipes.append(recipe)
+    return recipes
+
+
+@pytest.fixture
+def anonymous_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user_client(user):
+    client = APIClient()
+    token, _ = Token.objects.get_or_create(user=user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    client.get('/api/users/me/')
+    return client
+
+
+@pytest.fixture
+def count_queries():
+    def count(client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, response.content
+        return len(context.captured_queries), response
+
+    return count
@@ -0,0 +1,51 @@
+def test_warm_token_cache_needs_no_queries(ingredients, user_client, count_queries):
+    count_queries(user_client, '/api/ingredients/')
+    queries, _ = count_queries(user_client, '/api/ingredients/')
+
+    assert queries == 0
+
+
+def test_deactivated_user_loses_access_to_cached_token(
+    user, user_client, django_capture_on_commit_callbacks
+):
+    user.is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save()
+
+    response = user_client.get('/api/users/me/')
+
+    assert response.status_code == 401
+
+
+def test_cached_token_reflects_user_updates(
+    user, user_client, django_capture_on_commit_callbacks
+):
+    user.first_name = 'Другое'
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save(update_fields=['first_name'])
+
+    response = user_client.get('/api/users/me/')
+
+    assert response.json()['first_name'] == 'Другое'
+
+
+def test_deleted_token_is_rejected(
+    user, user_client, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        user.auth_token.delete()
+
+    response = user_client.get('/api/users/me/')
+
+    assert response.status_code == 401
+
+
+def test_deleted_user_is_rejected(
+    user, user_client, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    response = user_client.get('/api/users/me/')
+
+    assert response.status_code == 401
@@ -0,0 +1,34 @@
+import time
+
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection
+
+
+@pytest.fixture
+def usability_checks(db, monkeypatch):
+    checks = []
+    monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS', True)
+    monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECK_IDLE', 30)
+    monkeypatch.setattr(connection, 'is_usable', lambda: checks.append(1) or True)
+    connection.ensure_connection()
+    request_finished.disconnect(close_old_connections)
+    yield checks
+    request_finished.connect(close_old_connections)
+
+
+def test_busy_connection_is_not_pinged(usability_checks):
+    for _ in range(3):
+        request_started.send(sender=None)
+        request_finished.send(sender=None)
+
+    assert usability_checks == []
+
+
+def test_idle_connection_is_pinged(usability_checks, monkeypatch):
+    request_finished.send(sender=None)
+    monkeypatch.setattr(connection, 'idle_since', time.monotonic() - 60)
+
+    request_started.send(sender=None)
+
+    assert usability_checks == [1]
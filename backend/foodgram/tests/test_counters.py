@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from recipes.models import FavouriteRecipe, Recipe
+from shopping_cart.models import ShoppingOrder
+from users.models import Follow, User
+
+
+def assert_counters_match():
+    output = StringIO()
+    call_command('recount_counters', '--check', stdout=output)
+    assert output.getvalue().count('расхождений 0') == 4, output.getvalue()
+
+
+def test_counters_follow_api_changes(recipes, users, user, user_client):
+    recipe = recipes[1]
+    user_client.post(f'/api/recipes/{recipe.id}/favorite/')
+    user_client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+    user_client.post(f'/api/users/{users[1].id}/subscribe/')
+
+    recipe.refresh_from_db()
+    users[1].refresh_from_db()
+    user.refresh_from_db()
+    assert recipe.favourites_count == 1
+    assert users[1].followers_count == 1
+    assert user.cart_size == 1
+    assert users[1].recipes_count == 4
+    assert_counters_match()
+
+    user_client.delete(f'/api/recipes/{recipe.id}/favorite/')
+    user_client.delete(f'/api/recipes/{recipe.id}/shopping_cart/')
+    user_client.delete(f'/api/users/{users[1].id}/subscribe/')
+
+    assert_counters_match()
+
+
+def test_counters_follow_cascading_deletes(recipes, users):
+    for follower in users[1:]:
+        Follow.objects.create(user=follower, author=users[0])
+        FavouriteRecipe.objects.create(user=follower, recipe=recipes[0])
+        ShoppingOrder.objects.create(user=follower, recipe=recipes[0])
+    FavouriteRecipe.objects.create(user=users[0], recipe=recipes[1])
+    Follow.objects.create(user=users[0], author=users[1])
+
+    recipes[0].delete()
+    assert_counters_match()
+    assert User.objects.filter(cart_size=0).count() == len(users)
+
+    users[0].delete()
+    assert_counters_match()
+    assert not Recipe.objects.filter(author=users[0].pk).exists()
+    assert User.objects.get(pk=users[1].pk).followers_count == 0
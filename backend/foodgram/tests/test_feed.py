@@ -0,0 +1,59 @@
+import pytest
+
+from recipes.feed import rebuild_feeds
+from recipes.models import FeedItem
+from users.models import Follow
+
+
+@pytest.fixture
+def feed_recipes(settings, recipes, users, user):
+    settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+    Follow.objects.create(user=user, author=users[1])
+    Follow.objects.create(user=user, author=users[2])
+    Follow.objects.create(user=users[1], author=users[2])
+    rebuild_feeds()
+    return [recipe for recipe in recipes if recipe.author_id != user.id]
+
+
+def read_feed(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def test_feed_merges_pushed_and_pulled_authors(feed_recipes, users, user, user_client):
+    assert set(
+        FeedItem.objects.filter(user=user).values_list('recipe__author', flat=True)
+    ) == {users[1].id}
+
+    recipe_ids = []
+    url = '/api/recipes/feed/?limit=3'
+    while url:
+        data = read_feed(user_client, url)
+        recipe_ids.extend(recipe['id'] for recipe in data['results'])
+        url = data['next']
+
+    assert recipe_ids == sorted((recipe.id for recipe in feed_recipes), reverse=True)
+
+
+def test_feed_previous_page(feed_recipes, user_client):
+    first_page = read_feed(user_client, '/api/recipes/feed/?limit=3')
+    second_page = read_feed(user_client, first_page['next'])
+
+    previous_page = read_feed(user_client, second_page['previous'])
+
+    assert previous_page['results'] == first_page['results']
+    assert first_page['previous'] is None
+
+
+def test_feed_query_count_does_not_depend_on_page_size(
+    feed_recipes, user_client, count_queries
+):
+    first_page = read_feed(user_client, '/api/recipes/feed/?limit=3')
+    short_page_queries, _ = count_queries(user_client, first_page['next'])
+    long_page_queries, response = count_queries(
+        user_client, first_page['next'].replace('limit=3', 'limit=6')
+    )
+
+    assert short_page_queries == long_page_queries
+    assert len(response.json()['results']) == 5
@@ -0,0 +1,40 @@
+import base64
+import io
+import os
+
+import pytest
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+from api.fields import BASE64_CHUNK_SIZE, RecipeImageField
+
+
+@pytest.fixture
+def png():
+    image = Image.frombytes('RGB', (200, 200), os.urandom(200 * 200 * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    assert len(buffer.getvalue()) > BASE64_CHUNK_SIZE
+    return buffer.getvalue()
+
+
+def decode(data):
+    image_file = RecipeImageField().to_internal_value(data)
+    image_file.seek(0)
+    return image_file.read()
+
+
+@pytest.mark.parametrize(
+    'encode', [base64.b64encode, base64.encodebytes], ids=['plain', 'rfc2045']
+)
+def test_large_base64_image_is_decoded(png, encode):
+    data = 'data:image/png;base64,' + encode(png).decode()
+
+    assert decode(data) == png
+
+
+def test_truncated_base64_image_is_rejected(png):
+    data = 'data:image/png;base64,' + base64.b64encode(png).decode()[:-1]
+
+    with pytest.raises(ValidationError):
+        decode(data)
@@ -0,0 +1,29 @@
+from django.db import connection
+
+from api.explain import get_full_scans, get_hot_queries
+from recipes.models import FavouriteRecipe
+from shopping_cart.models import ShoppingOrder
+from shopping_cart.shopping_list import rebuild_shopping_lists
+from users.models import Follow
+
+
+def test_hot_queries_use_indexes(recipes, users):
+    for user in users:
+        for recipe in recipes[::2]:
+            FavouriteRecipe.objects.create(user=user, recipe=recipe)
+        for recipe in recipes[1::3]:
+            ShoppingOrder.objects.create(user=user, recipe=recipe)
+        for author in users:
+            if author != user:
+                Follow.objects.create(user=user, author=author)
+    rebuild_shopping_lists()
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+
+    full_scans = {
+        name: get_full_scans(queryset.explain())
+        for name, queryset in get_hot_queries().items()
+    }
+
+    assert {name: tables for name, tables in full_scans.items() if tables} == {}
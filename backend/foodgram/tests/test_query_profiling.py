@@ -0,0 +1,68 @@
+import pytest
+
+from api.middleware import QueryBudgetExceeded, query_stats
+from shopping_cart.models import ShoppingOrder
+from shopping_cart.shopping_list import rebuild_shopping_lists
+from users.models import Follow
+
+
+@pytest.fixture
+def enforce_budgets(settings, tmp_path):
+    settings.QUERY_PROFILING = {
+        **settings.QUERY_PROFILING,
+        'ENFORCE_BUDGETS': True,
+        'REPORT_DIR': str(tmp_path),
+    }
+    query_stats.samples.clear()
+    yield settings.QUERY_PROFILING
+    query_stats.samples.clear()
+    query_stats.unflushed = 0
+
+
+@pytest.mark.parametrize(
+    'url',
+    [
+        '/api/recipes/?limit=12',
+        '/api/recipes/feed/',
+        '/api/tags/',
+        '/api/ingredients/?name=ингр',
+        '/api/users/subscriptions/?recipes_limit=3',
+    ],
+)
+def test_endpoints_stay_within_query_budgets(
+    recipes, users, user, user_client, enforce_budgets, url
+):
+    Follow.objects.create(user=user, author=users[1])
+
+    response = user_client.get(url)
+
+    assert response.status_code == 200
+    assert 'Server-Timing' in response
+
+
+def test_recipe_detail_stays_within_query_budget(recipes, user_client, enforce_budgets):
+    response = user_client.get(f'/api/recipes/{recipes[0].id}/')
+
+    assert response.status_code == 200
+
+
+def test_budget_violation_raises(recipes, user_client, enforce_budgets):
+    enforce_budgets['BUDGETS'] = {'api:recipes-list': 1}
+
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get('/api/recipes/')
+
+
+def test_streaming_response_queries_are_counted(
+    recipes, user, user_client, enforce_budgets
+):
+    ShoppingOrder.objects.create(user=user, recipe=recipes[0])
+    rebuild_shopping_lists([user.pk])
+
+    response = user_client.get('/api/recipes/download_shopping_cart/')
+    assert 'api:recipes-download-shopping-cart' not in query_stats.samples
+    content = b''.join(response.streaming_content)
+
+    assert content
+    [sample] = query_stats.samples['api:recipes-download-shopping-cart']
+    assert sample[0] >= 1
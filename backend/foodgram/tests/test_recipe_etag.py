@@ -0,0 +1,60 @@
+import pytest
+
+
+def get_etag(client, recipe):
+    response = client.get(f'/api/recipes/{recipe.id}/')
+    assert response.status_code == 200, response.content
+    return response['ETag']
+
+
+def test_recipe_detail_hides_modified(recipes, anonymous_client):
+    response = anonymous_client.get(f'/api/recipes/{recipes[0].id}/')
+
+    assert 'modified' not in response.json()
+
+
+def test_recipe_detail_with_invalid_pk_is_not_found(recipes, anonymous_client):
+    response = anonymous_client.get('/api/recipes/abc/')
+
+    assert response.status_code == 404
+
+
+def test_recipe_detail_not_modified(recipes, user_client):
+    etag = get_etag(user_client, recipes[1])
+
+    response = user_client.get(
+        f'/api/recipes/{recipes[1].id}/', HTTP_IF_NONE_MATCH=etag
+    )
+
+    assert response.status_code == 304
+
+
+def test_anonymous_recipe_detail_not_modified_since(recipes, anonymous_client):
+    response = anonymous_client.get(f'/api/recipes/{recipes[0].id}/')
+
+    response = anonymous_client.get(
+        f'/api/recipes/{recipes[0].id}/',
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+    )
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    'url',
+    [
+        '/api/recipes/{recipe.id}/favorite/',
+        '/api/recipes/{recipe.id}/shopping_cart/',
+        '/api/users/{recipe.author_id}/subscribe/',
+    ],
+)
+def test_recipe_etag_changes_after_user_action(recipes, user_client, url):
+    recipe = recipes[1]
+    etag = get_etag(user_client, recipe)
+
+    response = user_client.post(url.format(recipe=recipe))
+    assert response.status_code == 201, response.content
+
+    assert get_etag(user_client, recipe) != etag
+    response = user_client.get(f'/api/recipes/{recipe.id}/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
@@ -0,0 +1,60 @@
+from recipes.models import FavouriteRecipe, RecipeIngredient
+from shopping_cart.models import ShoppingOrder
+from users.models import Follow
+
+
+def test_recipe_list_flags_do_not_depend_on_page_size(
+    recipes, user, user_client, count_queries
+):
+    FavouriteRecipe.objects.create(user=user, recipe=recipes[0])
+    ShoppingOrder.objects.create(user=user, recipe=recipes[1])
+
+    small_page, _ = count_queries(user_client, '/api/recipes/?limit=2')
+    large_page, response = count_queries(user_client, '/api/recipes/?limit=12')
+
+    assert small_page == large_page
+    results = {recipe['id']: recipe for recipe in response.json()['results']}
+    assert results[recipes[0].id]['is_favorited'] is True
+    assert results[recipes[1].id]['is_in_shopping_cart'] is True
+    assert results[recipes[2].id]['is_favorited'] is False
+
+
+def test_anonymous_recipe_list_does_not_depend_on_page_size(
+    recipes, anonymous_client, count_queries
+):
+    small_page, _ = count_queries(anonymous_client, '/api/recipes/?limit=2')
+    large_page, _ = count_queries(anonymous_client, '/api/recipes/?limit=12&page=1')
+
+    assert small_page == large_page
+
+
+def test_recipe_list_prefetches_tags_ingredients_and_subscriptions(
+    recipes, users, user, ingredients, user_client, count_queries
+):
+    Follow.objects.create(user=user, author=users[1])
+    few_ingredients, _ = count_queries(user_client, '/api/recipes/?limit=12')
+    for recipe in recipes:
+        RecipeIngredient.objects.bulk_create(
+            RecipeIngredient(recipe=recipe, ingredient=ingredient, amount=1)
+            for ingredient in ingredients
+            if not recipe.recipeingredient_set.filter(ingredient=ingredient).exists()
+        )
+    many_ingredients, response = count_queries(user_client, '/api/recipes/?limit=12')
+
+    assert few_ingredients == many_ingredients
+    results = response.json()['results']
+    assert all(len(recipe['ingredients']) == len(ingredients) for recipe in results)
+    assert all(len(recipe['tags']) >= 1 for recipe in results)
+    assert {
+        recipe['author']['id']
+        for recipe in results
+        if recipe['author']['is_subscribed']
+    } == {users[1].id}
+
+
+def test_recipe_detail_query_count(recipes, user_client, count_queries):
+    first, _ = count_queries(user_client, f'/api/recipes/{recipes[0].id}/')
+    second, response = count_queries(user_client, f'/api/recipes/{recipes[3].id}/')
+
+    assert first == second
+    assert len(response.json()['ingredients']) == 5
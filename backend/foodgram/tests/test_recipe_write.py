@@ -0,0 +1,78 @@
+import pytest
+from django.core.files.storage import default_storage
+
+from recipes.images import create_image_variants
+from recipes.models import Recipe
+
+IMAGE = (
+    'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABAgMAAABieywaAAAACVBMVEU'
+    'AAAD///9fX1/S0ecCAAAACXBIWXMAAA7EAAAOxAGVKw4bAAAACklEQVQImWNoAAAAggCByxOyYQ'
+    'AAAABJRU5ErkJggg=='
+)
+
+
+def get_recipe_data(tags, ingredients, amount=100):
+    return {
+        'name': 'Новый рецепт',
+        'text': 'Описание',
+        'cooking_time': 15,
+        'image': IMAGE,
+        'tags': [tag.id for tag in tags[:2]],
+        'ingredients': [
+            {'id': ingredient.id, 'amount': amount} for ingredient in ingredients[:3]
+        ],
+    }
+
+
+def test_create_recipe(tags, ingredients, user_client):
+    response = user_client.post(
+        '/api/recipes/', get_recipe_data(tags, ingredients), format='json'
+    )
+
+    assert response.status_code == 201, response.content
+    assert len(response.json()['ingredients']) == 3
+
+
+@pytest.mark.parametrize('amount', [0, -5])
+def test_create_recipe_rejects_non_positive_amount(
+    tags, ingredients, user_client, amount
+):
+    response = user_client.post(
+        '/api/recipes/', get_recipe_data(tags, ingredients, amount), format='json'
+    )
+
+    assert response.status_code == 400
+    assert not Recipe.objects.exists()
+
+
+def test_image_variants_are_rendered_without_storage_lookups(
+    tags, ingredients, user_client, monkeypatch, settings
+):
+    response = user_client.post(
+        '/api/recipes/', get_recipe_data(tags, ingredients), format='json'
+    )
+    assert response.status_code == 201, response.content
+
+    def exists(name):
+        raise AssertionError(f'Обращение к хранилищу: {name}')
+
+    monkeypatch.setattr(default_storage, 'exists', exists)
+    response = user_client.get('/api/recipes/')
+
+    image_variants = response.json()['results'][0]['image_variants']
+    assert set(image_variants) == set(settings.RECIPE_IMAGE_VARIANTS)
+    assert image_variants['thumbnail']['webp'].endswith('_thumbnail.webp')
+
+
+def test_same_image_reuses_ready_variants(tags, ingredients, user_client, settings):
+    settings.TASKS = {**settings.TASKS, 'SYNC': False}
+    user_client.post('/api/recipes/', get_recipe_data(tags, ingredients), format='json')
+    recipe = Recipe.objects.get()
+    create_image_variants(recipe.image.name)
+
+    response = user_client.post(
+        '/api/recipes/', get_recipe_data(tags, ingredients), format='json'
+    )
+
+    assert response.status_code == 201, response.content
+    assert Recipe.objects.get(pk=response.json()['id']).ready_image_variants
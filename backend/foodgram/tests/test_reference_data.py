@@ -0,0 +1,47 @@
+from recipes.cache import reference_data
+
+
+def test_tags_are_served_from_cache(tags, anonymous_client, count_queries):
+    count_queries(anonymous_client, '/api/tags/')
+    queries, response = count_queries(anonymous_client, '/api/tags/')
+
+    assert queries == 0
+    assert len(response.json()) == len(tags)
+
+
+def test_ingredient_search_is_served_from_cache(
+    ingredients, anonymous_client, count_queries
+):
+    count_queries(anonymous_client, '/api/ingredients/')
+    queries, response = count_queries(anonymous_client, '/api/ingredients/?name=ингр')
+
+    assert queries == 0
+    assert len(response.json()) == len(ingredients)
+
+
+def test_ingredient_search_validates_limit(ingredients, anonymous_client):
+    response = anonymous_client.get('/api/ingredients/?limit=0')
+
+    assert response.status_code == 400
+    assert 'limit' in response.json()
+
+
+def test_ingredient_search_limit(ingredients, anonymous_client):
+    response = anonymous_client.get('/api/ingredients/?name=ингр&limit=3')
+
+    assert len(response.json()) == 3
+
+
+def test_tag_change_invalidates_cache_after_commit(
+    tags, anonymous_client, django_capture_on_commit_callbacks
+):
+    anonymous_client.get('/api/tags/')
+    version = reference_data.get_version()
+    tags[0].name = 'Завтрак'
+    with django_capture_on_commit_callbacks(execute=True):
+        tags[0].save()
+        assert reference_data.get_version() == version
+
+    response = anonymous_client.get(f'/api/tags/{tags[0].id}/')
+
+    assert response.json()['name'] == 'Завтрак'
@@ -0,0 +1,50 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import ORJSONRenderer
+
+VALUES = {
+    'decimal': {'amount': Decimal('1.50')},
+    'datetime': {'created': datetime.datetime(2026, 10, 18, 12, 30, 15, 123456)},
+    'aware_datetime': {
+        'created': datetime.datetime(2026, 10, 18, 12, 30, tzinfo=datetime.timezone.utc)
+    },
+    'date_and_time': {'day': datetime.date(2026, 10, 18), 'at': datetime.time(9, 5)},
+    'lazy_string': {'detail': gettext_lazy('User inactive or deleted.')},
+    'line_separators': {'text': 'строка\u2028абзац\u2029конец'},
+    'oversized_int': {'id': 2**64},
+    'int_keys': {1: 'один', 2: ['два']},
+    'unicode': ['Рецепт', {'name': 'Щи', 'cooking_time': 10, 'ok': True}],
+    'none': {'next': None},
+}
+
+
+@pytest.mark.parametrize('data', VALUES.values(), ids=VALUES.keys())
+def test_output_matches_json_renderer(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize('data', VALUES.values(), ids=VALUES.keys())
+def test_output_matches_json_renderer_without_orjson(data, monkeypatch):
+    monkeypatch.setattr(renderers, 'orjson', None)
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_indent_falls_back_to_json_renderer():
+    data = VALUES['unicode']
+    media_type = 'application/json; indent=4'
+
+    content = ORJSONRenderer().render(data, media_type)
+
+    assert content == JSONRenderer().render(data, media_type)
+    assert b'\n    ' in content
+
+
+def test_none_renders_empty_body():
+    assert ORJSONRenderer().render(None) == b''
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import update_last_login
+
+from api.cache import invalidate_recipe_responses
+
+
+def test_anonymous_recipe_list_is_cached(recipes, anonymous_client, count_queries):
+    count_queries(anonymous_client, '/api/recipes/')
+    queries, _ = count_queries(anonymous_client, '/api/recipes/')
+
+    assert queries == 0
+
+
+def test_login_keeps_cached_recipe_responses(
+    recipes, users, anonymous_client, count_queries
+):
+    count_queries(anonymous_client, '/api/recipes/')
+    update_last_login(None, users[0])
+
+    queries, _ = count_queries(anonymous_client, '/api/recipes/')
+
+    assert queries == 0
+
+
+def test_author_rename_invalidates_cached_recipe_responses(
+    recipes, users, anonymous_client, django_capture_on_commit_callbacks
+):
+    anonymous_client.get('/api/recipes/')
+    users[0].first_name = 'Новое имя'
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        users[0].save(update_fields=['first_name'])
+    assert invalidate_recipe_responses in callbacks
+
+    response = anonymous_client.get('/api/recipes/')
+
+    authors = {
+        recipe['author']['id']: recipe['author']
+        for recipe in response.json()['results']
+    }
+    assert authors[users[0].id]['first_name'] == 'Новое имя'
+
+
+def test_cached_recipe_responses_depend_on_host(recipes, anonymous_client):
+    anonymous_client.get('/api/recipes/?limit=2', HTTP_HOST='myfoodgram.ddns.net')
+
+    response = anonymous_client.get('/api/recipes/?limit=2', HTTP_HOST='localhost')
+
+    assert response.json()['next'].startswith('http://localhost/')
+    assert response.json()['results'][0]['image'].startswith('http://localhost/')
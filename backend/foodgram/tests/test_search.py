@@ -0,0 +1,121 @@
+import pytest
+from django.core import serializers
+
+from recipes.models import Recipe
+from recipes.search import recipe_search_index, update_search_documents
+
+
+@pytest.fixture
+def indexed_recipes(recipes, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        update_search_documents([recipe.id for recipe in recipes])
+    return recipes
+
+
+def search(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.content
+    data = response.json()
+    return data['count'], [recipe['id'] for recipe in data['results']]
+
+
+def test_search_paginates_all_matches(indexed_recipes, anonymous_client):
+    found_ids = []
+    for page in range(1, 4):
+        count, page_ids = search(
+            anonymous_client, f'/api/recipes/?search=рецепт&limit=5&page={page}'
+        )
+        assert count == len(indexed_recipes)
+        found_ids.extend(page_ids)
+
+    assert sorted(found_ids) == sorted(recipe.id for recipe in indexed_recipes)
+
+
+def test_search_count_respects_filters(indexed_recipes, tags, anonymous_client):
+    count, page_ids = search(
+        anonymous_client, f'/api/recipes/?search=рецепт&tags={tags[2].slug}&limit=2'
+    )
+
+    assert count == 4
+    assert len(page_ids) == 2
+
+
+def test_recipe_update_reindexes_without_full_reload(
+    indexed_recipes, monkeypatch, django_capture_on_commit_callbacks
+):
+    matches = recipe_search_index.search('рецепт')
+    monkeypatch.setattr(
+        recipe_search_index, 'load', lambda: pytest.fail('Индекс перестроен целиком')
+    )
+    recipe = indexed_recipes[0]
+    recipe.name = 'Борщ'
+    with django_capture_on_commit_callbacks(execute=True):
+        recipe.save()
+        update_search_documents([recipe.id])
+
+    assert recipe_search_index.search('борщ') == [recipe.id]
+    assert recipe_search_index.search('рецепт') == [
+        recipe_id for recipe_id in matches if recipe_id != recipe.id
+    ]
+
+
+def test_deleted_recipe_leaves_index(indexed_recipes):
+    recipe_search_index.search('рецепт')
+    recipe = indexed_recipes[0]
+    recipe_id = recipe.id
+    recipe.delete()
+    recipe_search_index.invalidate()
+
+    assert recipe_id not in recipe_search_index.search('рецепт')
+
+
+def test_tag_delete_reindexes_recipes(
+    indexed_recipes, tags, anonymous_client, django_capture_on_commit_callbacks
+):
+    tag = tags[2]
+    tag.name = 'Десерт'
+    with django_capture_on_commit_callbacks(execute=True):
+        tag.save()
+    assert search(anonymous_client, '/api/recipes/?search=десерт')[0] == 4
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tag.delete()
+
+    assert search(anonymous_client, '/api/recipes/?search=десерт')[0] == 0
+    assert not Recipe.objects.filter(search_document__icontains='десерт').exists()
+
+
+def get_modified(recipes):
+    return dict(
+        Recipe.objects.filter(pk__in=[recipe.id for recipe in recipes]).values_list(
+            'id', 'modified'
+        )
+    )
+
+
+def test_reindex_keeps_modified_of_unchanged_documents(indexed_recipes):
+    modified = get_modified(indexed_recipes)
+
+    update_search_documents([recipe.id for recipe in indexed_recipes])
+
+    assert get_modified(indexed_recipes) == modified
+
+
+def test_tag_colour_change_does_not_reindex(indexed_recipes, tags):
+    modified = get_modified(indexed_recipes)
+    tags[0].color = '#000000'
+    tags[0].save()
+
+    assert get_modified(indexed_recipes) == modified
+
+
+def test_loaddata_does_not_reindex(indexed_recipes, tags):
+    modified = get_modified(indexed_recipes)
+    tags[0].name = 'Ужин'
+    for fixture in serializers.deserialize(
+        'json', serializers.serialize('json', [tags[0]])
+    ):
+        fixture.save()
+
+    assert get_modified(indexed_recipes) == modified
+    assert not Recipe.objects.filter(search_document__icontains='ужин').exists()
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from recipes.models import Ingredient, MeasurementUnit, Recipe, RecipeIngredient
+from shopping_cart.models import ShoppingOrder
+
+CART = (
+    (('Мука', 'г', 500), ('Сахар', 'г', 300), ('Молоко', 'мл', 250)),
+    (('Мука', 'кг', 1), ('Молоко', 'л', 1), ('Яйцо', 'шт', 3)),
+)
+
+
+@pytest.fixture
+def units(db):
+    for name in ('г', 'мл', 'шт'):
+        MeasurementUnit.objects.create(name=name)
+    MeasurementUnit.objects.create(name='кг', base_unit_id='г', factor=1000)
+    MeasurementUnit.objects.create(name='л', base_unit_id='мл', factor=1000)
+
+
+@pytest.fixture
+def cart(units, user):
+    for index, items in enumerate(CART):
+        recipe = Recipe.objects.create(
+            name=f'Рецепт {index}',
+            text='Описание',
+            cooking_time=10,
+            image='recipes/recipe.png',
+            author=user,
+        )
+        for name, unit, amount in items:
+            ingredient, _ = Ingredient.objects.get_or_create(
+                name=name, measurement_unit_id=unit
+            )
+            RecipeIngredient.objects.create(
+                recipe=recipe, ingredient=ingredient, amount=amount
+            )
+        ShoppingOrder.objects.create(user=user, recipe=recipe)
+
+
+def download(client, file_format, units):
+    response = client.get(
+        f'/api/recipes/download_shopping_cart/?file_format={file_format}&units={units}'
+    )
+    assert response.status_code == 200, response.content
+    return b''.join(response.streaming_content).decode()
+
+
+def test_base_units_merge_and_pick_readable_unit(cart, user_client):
+    items = json.loads(download(user_client, 'json', 'base'))
+
+    assert items == [
+        {'name': 'Молоко', 'amount': 1.25, 'measurement_unit': 'л'},
+        {'name': 'Мука', 'amount': 1.5, 'measurement_unit': 'кг'},
+        {'name': 'Сахар', 'amount': 300, 'measurement_unit': 'г'},
+        {'name': 'Яйцо', 'amount': 3, 'measurement_unit': 'шт'},
+    ]
+
+
+def test_recipe_units_are_not_merged(cart, user_client):
+    items = json.loads(download(user_client, 'json', 'recipe'))
+
+    assert {
+        (item['name'], item['measurement_unit'], item['amount'])
+        for item in items
+        if item['name'] == 'Мука'
+    } == {('Мука', 'г', 500), ('Мука', 'кг', 1)}
+
+
+def test_base_units_in_txt_export(cart, user_client):
+    lines = download(user_client, 'txt', 'base').splitlines()
+
+    assert lines[1:] == [
+        '- Молоко: 1.25 л',
+        '- Мука: 1.5 кг',
+        '- Сахар: 300 г',
+        '- Яйцо: 3 шт',
+    ]
+
+
+def test_base_units_in_csv_export(cart, user_client):
+    rows = list(csv.reader(io.StringIO(download(user_client, 'csv', 'base'))))
+
+    assert rows == [
+        ['name', 'amount', 'measurement_unit'],
+        ['Молоко', '1.25', 'л'],
+        ['Мука', '1.5', 'кг'],
+        ['Сахар', '300', 'г'],
+        ['Яйцо', '3', 'шт'],
+    ]
+
+
+def test_rounding_to_readable_unit(units, user, user_client):
+    recipe = Recipe.objects.create(
+        name='Рецепт',
+        text='Описание',
+        cooking_time=10,
+        image='recipes/recipe.png',
+        author=user,
+    )
+    ingredient = Ingredient.objects.create(name='Мука', measurement_unit_id='г')
+    RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient, amount=1234)
+    ShoppingOrder.objects.create(user=user, recipe=recipe)
+
+    items = json.loads(download(user_client, 'json', 'base'))
+
+    assert items == [{'name': 'Мука', 'amount': 1.23, 'measurement_unit': 'кг'}]
+
+
+def test_import_ingredients_fills_unit_conversions(db, tmp_path):
+    path = tmp_path / 'ingredients.csv'
+    path.write_text('мука,г\nмука,кг\nмолоко,мл\nмолоко,л\n', encoding='utf-8')
+
+    call_command('import_ingredients', str(path), stdout=io.StringIO())
+
+    conversions = dict(
+        MeasurementUnit.objects.filter(base_unit__isnull=False).values_list(
+            'name', 'base_unit'
+        )
+    )
+    assert conversions == {'кг': 'г', 'л': 'мл'}
+    assert MeasurementUnit.objects.get(name='кг').factor == 1000
@@ -0,0 +1,144 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from recipes.models import RecipeIngredient
+from shopping_cart import shopping_list
+from shopping_cart.models import ShoppingListItem, ShoppingOrder
+
+
+def get_shopping_list(user):
+    return dict(
+        ShoppingListItem.objects.filter(user=user).values_list(
+            'ingredient_id', 'amount'
+        )
+    )
+
+
+def assert_shopping_list_is_consistent(user):
+    current = get_shopping_list(user)
+    shopping_list.rebuild_shopping_lists([user.pk])
+    assert get_shopping_list(user) == current
+
+
+def get_expected_shopping_list(recipes):
+    expected = {}
+    for recipe in recipes:
+        for item in recipe.recipeingredient_set.all():
+            expected[item.ingredient_id] = (
+                expected.get(item.ingredient_id, 0) + item.amount
+            )
+    return expected
+
+
+def test_cart_changes_update_shopping_list(recipes, user, user_client):
+    for recipe in recipes[:3]:
+        user_client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+    assert get_shopping_list(user) == get_expected_shopping_list(recipes[:3])
+
+    user_client.delete(f'/api/recipes/{recipes[1].id}/shopping_cart/')
+
+    assert get_shopping_list(user) == get_expected_shopping_list(
+        [recipes[0], recipes[2]]
+    )
+
+
+def test_concurrently_inserted_row_is_updated(recipes, user, ingredients, monkeypatch):
+    ShoppingListItem.objects.create(user=user, ingredient=ingredients[0], amount=5)
+    lock = shopping_list.lock_shopping_list_items
+    calls = []
+
+    def lock_missing_first(user_ids, ingredient_ids):
+        calls.append(1)
+        return {} if len(calls) == 1 else lock(user_ids, ingredient_ids)
+
+    monkeypatch.setattr(shopping_list, 'lock_shopping_list_items', lock_missing_first)
+
+    shopping_list.update_shopping_lists([user.pk], {ingredients[0].id: 10})
+
+    assert get_shopping_list(user) == {ingredients[0].id: 15}
+
+
+def test_rebuild_command_repairs_shopping_lists(recipes, user, user_client):
+    for recipe in recipes[:2]:
+        user_client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+    expected = get_shopping_list(user)
+    ShoppingListItem.objects.filter(user=user).update(amount=1)
+
+    call_command('rebuild_shopping_lists', '--user', str(user.pk), stdout=StringIO())
+
+    assert get_shopping_list(user) == expected
+
+
+def test_order_model_changes_update_shopping_list(recipes, user):
+    orders = [
+        ShoppingOrder.objects.create(user=user, recipe=recipe) for recipe in recipes[:2]
+    ]
+    assert get_shopping_list(user) == get_expected_shopping_list(recipes[:2])
+
+    orders[0].delete()
+
+    assert get_shopping_list(user) == get_expected_shopping_list(recipes[1:2])
+
+
+def test_recipe_ingredient_changes_update_shopping_lists(
+    recipes, users, user, ingredients
+):
+    recipe = recipes[1]
+    for shopper in users:
+        ShoppingOrder.objects.create(user=shopper, recipe=recipe)
+    items = list(recipe.recipeingredient_set.all())
+
+    items[0].amount = 300
+    items[0].save()
+    items[1].ingredient = ingredients[9]
+    items[1].save()
+    items[2].delete()
+    RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredients[8], amount=7)
+
+    assert get_shopping_list(user) == get_expected_shopping_list([recipe])
+    assert_shopping_list_is_consistent(user)
+
+
+def test_recipe_update_keeps_shopping_list_consistent(
+    recipes, user, users, ingredients, user_client
+):
+    recipe = recipes[0]
+    ShoppingOrder.objects.create(user=users[1], recipe=recipe)
+    data = {
+        'name': recipe.name,
+        'text': recipe.text,
+        'cooking_time': recipe.cooking_time,
+        'tags': [tag.id for tag in recipe.tags.all()],
+        'ingredients': [
+            {'id': ingredients[0].id, 'amount': 50},
+            {'id': ingredients[5].id, 'amount': 20},
+        ],
+    }
+
+    response = user_client.patch(f'/api/recipes/{recipe.id}/', data, format='json')
+
+    assert response.status_code == 200, response.content
+    assert get_shopping_list(users[1]) == {ingredients[0].id: 50, ingredients[5].id: 20}
+
+
+def test_author_deletion_clears_shopping_lists(recipes, users, user):
+    for recipe in recipes:
+        if recipe.author_id == users[1].id:
+            ShoppingOrder.objects.create(user=user, recipe=recipe)
+
+    users[1].delete()
+
+    assert get_shopping_list(user) == {}
+
+
+def test_recipe_deletion_updates_shopping_lists(recipes, users, user, user_client):
+    for shopper in users:
+        ShoppingOrder.objects.create(user=shopper, recipe=recipes[0])
+        ShoppingOrder.objects.create(user=shopper, recipe=recipes[3])
+
+    response = user_client.delete(f'/api/recipes/{recipes[0].id}/')
+
+    assert response.status_code == 204
+    for shopper in users:
+        assert get_shopping_list(shopper) == get_expected_shopping_list(recipes[3:4])
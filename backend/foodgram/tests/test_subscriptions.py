@@ -0,0 +1,28 @@
+from users.models import Follow
+
+
+def test_subscriptions_query_count_does_not_depend_on_authors(
+    recipes, users, user, user_client, count_queries
+):
+    Follow.objects.create(user=user, author=users[1])
+    one_author, _ = count_queries(user_client, '/api/users/subscriptions/')
+    Follow.objects.create(user=user, author=users[2])
+    two_authors, response = count_queries(
+        user_client, '/api/users/subscriptions/?recipes_limit=2'
+    )
+
+    assert one_author == two_authors
+    results = response.json()['results']
+    assert {author['id'] for author in results} == {users[1].id, users[2].id}
+    for author in results:
+        assert author['recipes_count'] == 4
+        assert len(author['recipes']) == 2
+        assert author['recipes'][0]['id'] > author['recipes'][1]['id']
+
+
+def test_subscriptions_recipes_limit_must_be_integer(users, user, user_client):
+    Follow.objects.create(user=user, author=users[1])
+
+    response = user_client.get('/api/users/subscriptions/?recipes_limit=abc')
+
+    assert response.status_code == 400
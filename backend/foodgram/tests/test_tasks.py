@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import claim_tasks, enqueue, purge_finished_tasks, run_task, task
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='tests.fail', max_attempts=3)
+def fail():
+    raise RuntimeError('Ошибка задачи')
+
+
+@pytest.fixture(autouse=True)
+def queue(settings, db):
+    settings.TASKS = {**settings.TASKS, 'SYNC': False}
+    calls.clear()
+
+
+def make_due(task_id):
+    Task.objects.filter(pk=task_id).update(run_after=timezone.now())
+
+
+def test_enqueued_task_is_claimed_and_run():
+    created = enqueue(record, 5)
+
+    (claimed,) = claim_tasks(10)
+
+    assert claimed.pk == created.pk
+    assert Task.objects.get(pk=created.pk).status == Task.RUNNING
+    assert claim_tasks(10) == []
+    assert run_task(claimed)
+    assert calls == [5]
+    assert Task.objects.get(pk=created.pk).status == Task.DONE
+
+
+def test_failed_task_is_retried_with_backoff(settings):
+    created = enqueue(fail)
+    delays = []
+    for _ in range(2):
+        (claimed,) = claim_tasks(10)
+        started = timezone.now()
+        assert not run_task(claimed)
+        retried = Task.objects.get(pk=created.pk)
+        assert retried.status == Task.PENDING
+        assert claim_tasks(10) == []
+        delays.append((retried.run_after - started).total_seconds())
+        make_due(created.pk)
+
+    (claimed,) = claim_tasks(10)
+    assert not run_task(claimed)
+
+    failed = Task.objects.get(pk=created.pk)
+    assert failed.status == Task.FAILED
+    assert failed.attempts == 3
+    assert 'Ошибка задачи' in failed.last_error
+    delay = settings.TASKS['RETRY_DELAY']
+    assert delay <= delays[0] < delay + 1
+    assert 2 * delay <= delays[1] < 2 * delay + 1
+
+
+def test_unregistered_task_fails_without_retries():
+    Task.objects.create(name='tests.missing')
+
+    (claimed,) = claim_tasks(10)
+
+    assert not run_task(claimed)
+    assert Task.objects.get(pk=claimed.pk).status == Task.FAILED
+
+
+def test_stale_running_task_is_claimed_again(settings):
+    created = enqueue(record, 1)
+    claim_tasks(10)
+    Task.objects.filter(pk=created.pk).update(
+        locked_at=timezone.now() - timedelta(seconds=settings.TASKS['LOCK_TIMEOUT'] + 1)
+    )
+
+    (claimed,) = claim_tasks(10)
+
+    assert claimed.pk == created.pk
+    assert claimed.attempts == 2
+
+
+def test_idempotency_key_reuses_task():
+    first = enqueue(record, 1, idempotency_key='record:1')
+    second = enqueue(record, 1, idempotency_key='record:1')
+
+    assert first.pk == second.pk
+    assert Task.objects.count() == 1
+
+
+def test_idempotency_key_requeues_failed_task():
+    created = enqueue(record, 1, idempotency_key='record:1')
+    Task.objects.filter(pk=created.pk).update(
+        status=Task.FAILED, attempts=3, finished=timezone.now(), last_error='Ошибка'
+    )
+
+    requeued = enqueue(record, 2, idempotency_key='record:1')
+
+    assert requeued.pk == created.pk
+    assert requeued.status == Task.PENDING
+    assert requeued.attempts == 0
+    (claimed,) = claim_tasks(10)
+    assert run_task(claimed)
+    assert calls == [2]
+
+
+def test_idempotency_key_keeps_finished_task():
+    created = enqueue(record, 1, idempotency_key='record:1')
+    run_task(claim_tasks(10)[0])
+
+    assert enqueue(record, 1, idempotency_key='record:1').status == Task.DONE
+    assert Task.objects.get(pk=created.pk).status == Task.DONE
+
+
+def test_purge_removes_only_old_finished_tasks(settings):
+    old = enqueue(record, 1)
+    recent = enqueue(record, 2)
+    for claimed in claim_tasks(10):
+        run_task(claimed)
+    Task.objects.filter(pk=old.pk).update(
+        finished=timezone.now() - timedelta(seconds=settings.TASKS['KEEP_FINISHED'] + 1)
+    )
+
+    assert purge_finished_tasks() == 1
+    assert list(Task.objects.values_list('pk', flat=True)) == [recent.pk]
@@ -0,0 +1,28 @@
+from django.db.models import F
+
+from recipes.models import FavouriteRecipe, Recipe
+from shopping_cart.models import ShoppingOrder
+
+from .models import Follow, User
+
+COUNTERS = (
+    (Recipe, 'favourites_count', FavouriteRecipe, 'recipe'),
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'followers_count', Follow, 'author'),
+    (User, 'cart_size', ShoppingOrder, 'user'),
+)
+
+
+def update_counter(model, pk, field, delta):
+    counter_query = model.objects.filter(pk=pk)
+    if delta < 0:
+        counter_query = counter_query.filter(**{f'{field}__gte': -delta})
+    counter_query.update(**{field: F(field) + delta})
+
+
+def update_related_counters(instance, delta):
+    for model, field, related_model, related_field in COUNTERS:
+        if isinstance(instance, related_model):
+            update_counter(
+                model, getattr(instance, f'{related_field}_id'), field, delta
+            )
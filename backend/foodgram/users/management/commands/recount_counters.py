@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from users.counters import COUNTERS
+
+
+def count_related(related_model, related_field):
+    return Coalesce(
+        Subquery(
+            related_model.objects.filter(**{related_field: OuterRef('pk')})
+            .order_by()
+            .values(related_field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики избранного, подписчиков, рецептов и корзины'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их',
+        )
+
+    def handle(self, *args, **options):
+        for model, field, related_model, related_field in COUNTERS:
+            actual_count = count_related(related_model, related_field)
+            with transaction.atomic():
+                broken = (
+                    model.objects.annotate(actual_count=actual_count)
+                    .exclude(**{field: F('actual_count')})
+                    .count()
+                )
+                if broken and not options['check']:
+                    model.objects.update(**{field: actual_count})
+            self.stdout.write(
+                f'{model._meta.label}.{field}: расхождений {broken}'
+                + ('' if options['check'] or not broken else ', исправлено')
+            )
@@ -9,6 +9,9 @@ class User(AbstractUser):
         max_length=254,
         error_messages={'unique': 'A user with that email already exists.'},
     )
+    recipes_count = models.PositiveIntegerField(default=0)
+    followers_count = models.PositiveIntegerField(default=0)
+    cart_size = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = 'email'
 
@@ -30,8 +33,12 @@ class User(AbstractUser):
 
 
 class Follow(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='follower')
-    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='following')
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='follower', db_index=False
+    )
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='following', db_index=False
+    )
 
     class Meta:
         ordering = ('-id',)
@@ -41,6 +48,9 @@ class Follow(models.Model):
                 name='follow_user_author_unique',
             ),
         ]
+        indexes = [
+            models.Index(fields=['author', 'user'], name='follow_author_user_idx'),
+        ]
 
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
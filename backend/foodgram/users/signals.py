@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+
+from .counters import COUNTERS, update_related_counters
+
+
+def increment_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_related_counters(instance, 1)
+
+
+def decrement_counters(sender, instance, **kwargs):
+    update_related_counters(instance, -1)
+
+
+for related_model in {related_model for _, _, related_model, _ in COUNTERS}:
+    post_save.connect(increment_counters, sender=related_model)
+    post_delete.connect(decrement_counters, sender=related_model)